@@ -2,9 +2,11 @@
 
 from typing import Annotated
 
-from fastapi import Depends
+import redis.asyncio as redis
+from fastapi import Depends, Request
 
 from src.config import Settings, settings
+from src.simulation.cache import current_redis
 
 
 def get_settings() -> Settings:
@@ -12,5 +14,18 @@ def get_settings() -> Settings:
     return settings
 
 
+async def get_redis_client(request: Request) -> redis.Redis | None:
+    """Return the app-wide Redis client created in the lifespan handler.
+
+    If Redis was down at startup, falls back to whatever client the cache
+    has connected since. Never connects itself, so it can't stall a request.
+    """
+    r: redis.Redis | None = getattr(request.app.state, "redis", None)
+    if r is None:
+        r = current_redis()
+    return r
+
+
 # Typed aliases for use with Annotated[..., Depends(...)]
 SettingsDep = Annotated[Settings, Depends(get_settings)]
+RedisDep = Annotated[redis.Redis | None, Depends(get_redis_client)]
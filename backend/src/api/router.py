@@ -6,6 +6,9 @@ from src.api.v1.convert import router as convert_router
 from src.api.v1.optimize import router as optimize_router
 from src.api.v1.ws import router as ws_router
 
+# No default_response_class on purpose: with FastAPI >= 0.130, endpoints that
+# declare a response_model are serialized straight to JSON bytes by pydantic-core,
+# which a custom JSON response class (ORJSONResponse) would disable.
 api_router = APIRouter()
 
 # V1 routes
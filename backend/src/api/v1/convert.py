@@ -8,8 +8,10 @@ Supports:
 """
 
 import logging
+from collections.abc import Callable
+from typing import TypeVar
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
 
 from src.models.antenna import Wire, Excitation, LumpedLoad, TransmissionLine
@@ -17,14 +19,15 @@ from src.models.ground import GroundConfig
 from src.converters.maa_import import parse_maa, MAAParseError
 from src.converters.maa_export import export_maa
 from src.converters.nec_file import parse_nec_file, NECParseError
-from src.simulation.nec_input import build_card_deck
-from src.models.simulation import SimulationRequest, FrequencyConfig
+from src.simulation.nec_input import build_export_card_deck
 from src.models.limits import MAX_FREQUENCY_MHZ, MIN_FREQUENCY_MHZ
 
 logger = logging.getLogger("antsim.api.convert")
 
 router = APIRouter()
 
+_H = TypeVar("_H")
+
 
 # ---- Request / Response Models ----
 
@@ -37,10 +40,10 @@ class ImportRequest(BaseModel):
 class ImportResponse(BaseModel):
     """Parsed antenna data from an imported file."""
     title: str
-    wires: list[dict]
-    excitations: list[dict]
-    loads: list[dict]
-    transmission_lines: list[dict]
+    wires: list[Wire]
+    excitations: list[Excitation]
+    loads: list[LumpedLoad]
+    transmission_lines: list[TransmissionLine]
     ground_type: str
     ground_dielectric: float
     ground_conductivity: float
@@ -71,105 +74,126 @@ class ExportResponse(BaseModel):
     filename_suggestion: str
 
 
-# ---- Endpoints ----
-
-@router.post("/convert/import", response_model=ImportResponse)
-async def import_file(request: ImportRequest) -> ImportResponse:
-    """Import a .maa or .nec file and return parsed antenna data."""
-    warnings: list[str] = []
-
-    if request.format.lower() == "maa":
-        try:
-            data = parse_maa(request.content)
-        except MAAParseError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid .maa file: {e}")
-
-        return ImportResponse(
-            title=data.title,
-            wires=[w.model_dump() for w in data.wires],
-            excitations=[e.model_dump() for e in data.excitations],
-            loads=[ld.model_dump() for ld in data.loads],
-            transmission_lines=[],
-            ground_type=data.ground.ground_type.value,
-            ground_dielectric=data.ground.dielectric_constant,
-            ground_conductivity=data.ground.conductivity,
-            frequency_start_mhz=max(MIN_FREQUENCY_MHZ, data.frequency_mhz - 0.5),
-            frequency_stop_mhz=min(MAX_FREQUENCY_MHZ, data.frequency_mhz + 0.5),
-            frequency_steps=21,
-            warnings=warnings,
-        )
-
-    elif request.format.lower() == "nec":
-        try:
-            data_nec = parse_nec_file(request.content)
-        except NECParseError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid .nec file: {e}")
-
-        return ImportResponse(
-            title=data_nec.comment,
-            wires=[w.model_dump() for w in data_nec.wires],
-            excitations=[e.model_dump() for e in data_nec.excitations],
-            loads=[ld.model_dump() for ld in data_nec.loads],
-            transmission_lines=[tl.model_dump() for tl in data_nec.transmission_lines],
-            ground_type=data_nec.ground.ground_type.value,
-            ground_dielectric=data_nec.ground.dielectric_constant,
-            ground_conductivity=data_nec.ground.conductivity,
-            frequency_start_mhz=data_nec.frequency_start_mhz,
-            frequency_stop_mhz=data_nec.frequency_stop_mhz,
-            frequency_steps=data_nec.frequency_steps,
-            warnings=warnings,
-        )
-
-    else:
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model to JSON bytes in a single pydantic-core pass."""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+# ---- Format handlers ----
+
+def _import_maa(content: str) -> ImportResponse:
+    try:
+        data = parse_maa(content)
+    except MAAParseError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid .maa file: {e}")
+
+    # Parser output is already validated, so skip re-validating every wire
+    return ImportResponse.model_construct(
+        title=data.title,
+        wires=data.wires,
+        excitations=data.excitations,
+        loads=data.loads,
+        transmission_lines=[],
+        ground_type=data.ground.ground_type.value,
+        ground_dielectric=data.ground.dielectric_constant,
+        ground_conductivity=data.ground.conductivity,
+        frequency_start_mhz=max(MIN_FREQUENCY_MHZ, data.frequency_mhz - 0.5),
+        frequency_stop_mhz=min(MAX_FREQUENCY_MHZ, data.frequency_mhz + 0.5),
+        frequency_steps=21,
+        warnings=[],
+    )
+
+
+def _import_nec(content: str) -> ImportResponse:
+    try:
+        data = parse_nec_file(content)
+    except NECParseError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid .nec file: {e}")
+
+    return ImportResponse.model_construct(
+        title=data.comment,
+        wires=data.wires,
+        excitations=data.excitations,
+        loads=data.loads,
+        transmission_lines=data.transmission_lines,
+        ground_type=data.ground.ground_type.value,
+        ground_dielectric=data.ground.dielectric_constant,
+        ground_conductivity=data.ground.conductivity,
+        frequency_start_mhz=data.frequency_start_mhz,
+        frequency_stop_mhz=data.frequency_stop_mhz,
+        frequency_steps=data.frequency_steps,
+        warnings=[],
+    )
+
+
+def _export_maa(request: ExportRequest) -> ExportResponse:
+    content = export_maa(
+        title=request.title,
+        wires=request.wires,
+        excitations=request.excitations,
+        loads=request.loads if request.loads else None,
+        frequency_mhz=(request.frequency_start_mhz + request.frequency_stop_mhz) / 2,
+    )
+    return ExportResponse(
+        content=content,
+        format="maa",
+        filename_suggestion="antenna.maa",
+    )
+
+
+def _export_nec(request: ExportRequest) -> ExportResponse:
+    # The request is already validated; build the deck straight from its parts
+    content = build_export_card_deck(
+        comment=request.title,
+        wires=request.wires,
+        excitations=request.excitations,
+        loads=request.loads,
+        transmission_lines=request.transmission_lines,
+        ground=request.ground,
+        start_mhz=request.frequency_start_mhz,
+        stop_mhz=request.frequency_stop_mhz,
+        steps=request.frequency_steps,
+    )
+    return ExportResponse(
+        content=content,
+        format="nec",
+        filename_suggestion="antenna.nec",
+    )
+
+
+# Format name (lowercase) -> handler, resolved with a single dict lookup per request
+_IMPORT_HANDLERS: dict[str, Callable[[str], ImportResponse]] = {
+    "maa": _import_maa,
+    "nec": _import_nec,
+}
+_EXPORT_HANDLERS: dict[str, Callable[[ExportRequest], ExportResponse]] = {
+    "maa": _export_maa,
+    "nec": _export_nec,
+}
+
+
+def _lookup_handler(handlers: dict[str, _H], fmt: str, direction: str) -> _H:
+    """Find the handler for `fmt`, trying the exact value before lowercasing."""
+    handler = handlers.get(fmt) or handlers.get(fmt.lower())
+    if handler is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported import format: '{request.format}'. Use 'maa' or 'nec'.",
+            detail=f"Unsupported {direction} format: '{fmt}'. Use 'maa' or 'nec'.",
         )
+    return handler
 
 
-@router.post("/convert/export", response_model=ExportResponse)
-async def export_file(request: ExportRequest) -> ExportResponse:
-    """Export antenna data to .maa or .nec format."""
+# ---- Endpoints ----
 
-    if request.format.lower() == "maa":
-        content = export_maa(
-            title=request.title,
-            wires=request.wires,
-            excitations=request.excitations,
-            loads=request.loads if request.loads else None,
-            frequency_mhz=(request.frequency_start_mhz + request.frequency_stop_mhz) / 2,
-        )
-        return ExportResponse(
-            content=content,
-            format="maa",
-            filename_suggestion="antenna.maa",
-        )
+@router.post("/convert/import", response_model=ImportResponse)
+async def import_file(request: ImportRequest) -> Response:
+    """Import a .maa or .nec file and return parsed antenna data."""
+    handler = _lookup_handler(_IMPORT_HANDLERS, request.format, "import")
+    return _json_response(handler(request.content))
 
-    elif request.format.lower() == "nec":
-        # Build a SimulationRequest to reuse the card deck builder
-        freq_config = FrequencyConfig(
-            start_mhz=request.frequency_start_mhz,
-            stop_mhz=request.frequency_stop_mhz,
-            steps=request.frequency_steps,
-        )
-        sim_request = SimulationRequest(
-            wires=request.wires,
-            excitations=request.excitations,
-            ground=request.ground,
-            frequency=freq_config,
-            comment=request.title,
-            loads=request.loads,
-            transmission_lines=request.transmission_lines,
-        )
-        content = build_card_deck(sim_request)
-        return ExportResponse(
-            content=content,
-            format="nec",
-            filename_suggestion="antenna.nec",
-        )
 
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported export format: '{request.format}'. Use 'maa' or 'nec'.",
-        )
+@router.post("/convert/export", response_model=ExportResponse)
+async def export_file(request: ExportRequest) -> Response:
+    """Export antenna data to .maa or .nec format."""
+    handler = _lookup_handler(_EXPORT_HANDLERS, request.format, "export")
+    return _json_response(handler(request))
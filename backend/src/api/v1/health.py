@@ -1,17 +1,25 @@
 """GET /api/v1/health — Service health check."""
 
-import shutil
+import asyncio
 import logging
+import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
-from src.simulation.cache import get_redis
+from src.api.deps import get_redis_client
+from src.simulation.nec_runner import NEC2C_PATH
 
 logger = logging.getLogger("antsim.health")
 
 router = APIRouter()
 
+# Upper bound on how long a degraded Redis can stall the health probe
+REDIS_PING_TIMEOUT_SECONDS = 0.25
+
+# Liveness probes poll this endpoint constantly; reuse the last answer briefly
+HEALTH_CACHE_TTL_SECONDS = 1.0
+
 
 class HealthResponse(BaseModel):
     status: str
@@ -21,27 +29,44 @@ class HealthResponse(BaseModel):
     environment: str
 
 
+async def _ping_redis(request: Request) -> bool:
+    """Look up the shared Redis client and ping it; False if there is none."""
+    r = await get_redis_client(request)
+    if r is None:
+        return False
+    await r.ping()
+    return True
+
+
+# (monotonic expiry, response) of the last computed health answer
+_cached_health: tuple[float, "HealthResponse"] | None = None
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check(request: Request) -> HealthResponse:
     """Check service health, nec2c availability, and Redis status."""
+    global _cached_health
     from src.config import settings
 
-    nec2c_path = shutil.which("nec2c")
+    now = time.monotonic()
+    if _cached_health is not None and _cached_health[0] > now:
+        return _cached_health[1]
 
     # Check Redis
     redis_connected = False
     try:
-        r = await get_redis()
-        if r is not None:
-            await r.ping()
-            redis_connected = True
+        redis_connected = await asyncio.wait_for(
+            _ping_redis(request), timeout=REDIS_PING_TIMEOUT_SECONDS
+        )
     except Exception:
         pass
 
-    return HealthResponse(
+    response = HealthResponse(
         status="ok",
         version=settings.version,
-        nec2c_available=nec2c_path is not None,
+        nec2c_available=NEC2C_PATH is not None,
         redis_connected=redis_connected,
         environment=settings.environment,
     )
+    _cached_health = (now + HEALTH_CACHE_TTL_SECONDS, response)
+    return response
@@ -2,30 +2,29 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException
 
 from src.models.optimization import OptimizationRequest, OptimizationResult
 from src.simulation.optimizer import run_optimization
-from src.core.rate_limiter import check_rate_limit, release_concurrent
+from src.core.rate_limiter import RateLimitedRoute
 
 logger = logging.getLogger("antsim.api.optimize")
 
-router = APIRouter()
+# Rate limits run before the request body is parsed (see RateLimitedRoute)
+router = APIRouter(route_class=RateLimitedRoute)
 
 
 @router.post("/optimize", response_model=OptimizationResult)
-async def optimize(request_body: OptimizationRequest, request: Request) -> OptimizationResult:
+async def optimize(request_body: OptimizationRequest) -> OptimizationResult:
     """Run antenna parameter optimization.
 
-    Uses Nelder-Mead optimization where each iteration runs a full NEC2 simulation.
+    Uses Nelder-Mead (or, with method="bayesian", a Gaussian-process surrogate)
+    optimization where each iteration runs a full NEC2 simulation.
     Supports min SWR, max gain, max F/B, and weighted combined objectives.
 
     Note: This is a synchronous endpoint. For real-time progress updates,
     use the WebSocket endpoint /api/v1/ws/optimize (V2 future).
     """
-    # Rate limit (optimization uses many sim cycles)
-    await check_rate_limit(request)
-
     try:
         logger.info(
             "Optimization request: %d variables, %s objective, max %d iterations",
@@ -52,5 +51,3 @@ async def optimize(request_body: OptimizationRequest, request: Request) -> Optim
                 "message": str(e),
             },
         )
-    finally:
-        await release_concurrent(request)
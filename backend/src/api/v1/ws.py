@@ -4,6 +4,7 @@ import asyncio
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, TypeAdapter
 
 from src.models.optimization import OptimizationRequest, OptimizationProgress
 from src.simulation.optimizer import run_optimization
@@ -12,6 +13,34 @@ logger = logging.getLogger("antsim.api.ws")
 
 router = APIRouter()
 
+# Progress events buffered per connection; the oldest are dropped when a slow
+# client falls behind so memory stays bounded and the newest state survives.
+PROGRESS_QUEUE_MAXSIZE = 64
+
+# Built once at import so batches are serialized in a single pydantic-core call
+_PROGRESS_ADAPTER = TypeAdapter(list[OptimizationProgress])
+
+
+def _message(msg_type: str, model: BaseModel) -> str:
+    """Build a {type, data} message by splicing the model's JSON in directly."""
+    return f'{{"type":"{msg_type}","data":{model.model_dump_json()}}}'
+
+
+def _progress_message(items: list[OptimizationProgress]) -> str:
+    """Frame pending progress events as one message (a batch if more than one)."""
+    if len(items) == 1:
+        return _message("progress", items[0])
+    data = _PROGRESS_ADAPTER.dump_json(items).decode()
+    return f'{{"type":"progress_batch","data":{data}}}'
+
+
+def _drain(queue: asyncio.Queue[OptimizationProgress]) -> list[OptimizationProgress]:
+    """Take everything currently queued without waiting."""
+    items: list[OptimizationProgress] = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
 
 @router.websocket("/ws/optimize")
 async def optimizer_ws(websocket: WebSocket) -> None:
@@ -20,7 +49,8 @@ async def optimizer_ws(websocket: WebSocket) -> None:
     Protocol:
     1. Client connects
     2. Client sends JSON optimization request (same schema as POST /optimize)
-    3. Server streams JSON progress messages: {type: "progress", data: {...}}
+    3. Server streams JSON progress messages: {type: "progress", data: {...}},
+       or {type: "progress_batch", data: [{...}, ...]} when several are pending
     4. Server sends final result: {type: "result", data: {...}}
     5. Connection closes
 
@@ -41,31 +71,38 @@ async def optimizer_ws(websocket: WebSocket) -> None:
         )
 
         # Shared state between the blocking optimizer thread and async WS sender
-        progress_queue: asyncio.Queue[OptimizationProgress] = asyncio.Queue()
+        progress_queue: asyncio.Queue[OptimizationProgress] = asyncio.Queue(
+            maxsize=PROGRESS_QUEUE_MAXSIZE
+        )
         cancelled = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def enqueue(progress: OptimizationProgress) -> None:
+            """Queue a progress event on the loop, dropping the oldest if full."""
+            try:
+                progress_queue.put_nowait(progress)
+            except asyncio.QueueFull:
+                try:
+                    progress_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                progress_queue.put_nowait(progress)
 
         def on_progress(progress: OptimizationProgress) -> None:
             """Called from the optimizer thread for each iteration."""
             if cancelled.is_set():
                 # Raise to abort scipy.optimize.minimize
                 raise InterruptedError("Optimization cancelled by client")
-            try:
-                progress_queue.put_nowait(progress)
-            except asyncio.QueueFull:
-                pass  # Drop if queue is full (shouldn't happen)
-
-        # Run optimizer in a thread pool to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
+            # asyncio.Queue is not thread-safe; hand the event over to the loop
+            loop.call_soon_threadsafe(enqueue, progress)
 
         async def send_progress() -> None:
-            """Drain progress queue and send to client."""
+            """Drain progress queue and send to client, one frame per tick."""
             while True:
                 try:
                     progress = await asyncio.wait_for(progress_queue.get(), timeout=0.5)
-                    await websocket.send_json({
-                        "type": "progress",
-                        "data": progress.model_dump(),
-                    })
+                    items = [progress, *_drain(progress_queue)]
+                    await websocket.send_text(_progress_message(items))
                 except TimeoutError:
                     pass  # No progress yet, keep waiting
                 except (WebSocketDisconnect, RuntimeError):
@@ -76,7 +113,7 @@ async def optimizer_ws(websocket: WebSocket) -> None:
         sender_task = asyncio.create_task(send_progress())
 
         try:
-            # Run the blocking optimizer in a thread
+            # Run the blocking optimizer in a thread pool to avoid blocking the event loop
             result = await loop.run_in_executor(
                 None,
                 lambda: run_optimization(request, on_progress=on_progress),
@@ -89,19 +126,13 @@ async def optimizer_ws(websocket: WebSocket) -> None:
             except asyncio.CancelledError:
                 pass
 
-            # Drain any remaining progress messages
-            while not progress_queue.empty():
-                progress = progress_queue.get_nowait()
-                await websocket.send_json({
-                    "type": "progress",
-                    "data": progress.model_dump(),
-                })
+            # Flush any remaining progress messages
+            remaining = _drain(progress_queue)
+            if remaining:
+                await websocket.send_text(_progress_message(remaining))
 
             # Send final result
-            await websocket.send_json({
-                "type": "result",
-                "data": result.model_dump(),
-            })
+            await websocket.send_text(_message("result", result))
 
         except InterruptedError:
             logger.info("WS optimizer cancelled by client")
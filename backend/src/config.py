@@ -1,12 +1,15 @@
+from functools import cached_property
 from pathlib import Path
+from typing import ClassVar
 
 from pydantic_settings import BaseSettings
 
 # Read version from VERSION file (lives at project root or /app in Docker)
-_VERSION_PATHS = [
-    Path(__file__).resolve().parent.parent / "VERSION",      # backend/VERSION (copied by Docker)
-    Path(__file__).resolve().parent.parent.parent / "VERSION",  # ../../VERSION (local dev)
-]
+_BASE = Path(__file__).resolve().parent.parent
+_VERSION_PATHS = (
+    _BASE / "VERSION",         # backend/VERSION (copied by Docker)
+    _BASE.parent / "VERSION",  # ../../VERSION (local dev)
+)
 _APP_VERSION = "0.0.0"
 for _vp in _VERSION_PATHS:
     if _vp.is_file():
@@ -20,9 +23,12 @@ class Settings(BaseSettings):
     environment: str = "development"
     allowed_origins: str = "http://localhost:5173"
     redis_url: str = "redis://redis:6379"
+    redis_max_connections: int = 64  # Shared pool size; callers wait when exhausted
     log_level: str = "info"
     sim_timeout_seconds: int = 180
-    nec_workdir: str = "/tmp/nec_workdir"
+    nec_workdir: str = ""  # Empty: /dev/shm/antsim (RAM) if writable, else /tmp/nec_workdir
+    max_body_bytes: int = 4 * 1024 * 1024  # Larger request bodies get a 413
+    optimizer_workers: int = 2  # Concurrent NEC2 runs in a differential-evolution optimization
 
     # Rate limiting (disabled by default — enable for public deployments)
     rate_limit_enabled: bool = False
@@ -30,15 +36,15 @@ class Settings(BaseSettings):
     rate_limit_window_seconds: int = 3600
     max_concurrent_per_ip: int = 5
 
-    @property
-    def version(self) -> str:
-        return _APP_VERSION
+    # Fixed at import time; a ClassVar so a VERSION env var cannot override it
+    version: ClassVar[str] = _APP_VERSION
 
-    @property
+    # Derived once per Settings instance; `settings` below lives for the process
+    @cached_property
     def cors_origins(self) -> list[str]:
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
-    @property
+    @cached_property
     def is_dev(self) -> bool:
         return self.environment == "development"
 
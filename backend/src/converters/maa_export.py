@@ -3,9 +3,41 @@
 Generates a .maa file that can be opened in MMANA-GAL, MMANA-GAL basic, etc.
 """
 
+import io
 import math
+
+import numpy as np
+
 from src.models.antenna import Wire, Excitation, LumpedLoad, LoadType
 
+# Per-row line formats, newline included (X1 Y1 Z1 X2 Y2 Z2 Radius N_segments, etc.)
+_WIRE_FMT = "%.6f, %.6f, %.6f, %.6f, %.6f, %.6f, %.6f, %d\n"
+_SRC_FMT = "%d, %d, %.6f, %.2f\n"
+# Load formats: Wire_num Seg_num R X L C, with how many of
+# (wire_tag, segment_start, param1, param2, param3) each one consumes
+_LOAD_FMTS: dict[LoadType, tuple[str, int]] = {
+    LoadType.SERIES_RLC: ("%d, %d, %.6g, 0, %.6g, %.6g\n", 5),
+    LoadType.FIXED_IMPEDANCE: ("%d, %d, %.6g, %.6g, 0, 0\n", 4),
+}
+# Wire conductivity and parallel RLC don't map cleanly to .maa
+_LOAD_OTHER_FMT = ("%d, %d, %.6g, %.6g, %.6g, 0\n", 5)
+
+# From this many sources on, magnitude/phase are computed in one numpy pass
+_NUMPY_SOURCE_THRESHOLD = 64
+
+
+def _source_polar(excitations: list[Excitation]) -> tuple[list[float], list[float]]:
+    """Return (magnitudes, phases in degrees) of the source voltages."""
+    n = len(excitations)
+    if n >= _NUMPY_SOURCE_THRESHOLD:
+        vr = np.fromiter((ex.voltage_real for ex in excitations), float, n)
+        vi = np.fromiter((ex.voltage_imag for ex in excitations), float, n)
+        return np.hypot(vr, vi).tolist(), np.degrees(np.arctan2(vi, vr)).tolist()
+    return (
+        [math.hypot(ex.voltage_real, ex.voltage_imag) for ex in excitations],
+        [math.degrees(math.atan2(ex.voltage_imag, ex.voltage_real)) for ex in excitations],
+    )
+
 
 def export_maa(
     title: str,
@@ -26,61 +58,46 @@ def export_maa(
     Returns:
         String content of the .maa file.
     """
-    lines: list[str] = []
+    buf = io.StringIO()
+    write = buf.write
     loads = loads or []
 
     # Line 0: Title
-    lines.append(title or "AntennaSim export")
+    write(f"{title or 'AntennaSim export'}\n")
 
     # Line 1: Frequency info
-    lines.append(f"{frequency_mhz:.6f}")
+    write(f"{frequency_mhz:.6f}\n")
 
     # Line 2: Counts: N_wires N_loads N_sources
-    lines.append(f"{len(wires)} {len(loads)} {len(excitations)}")
+    write(f"{len(wires)} {len(loads)} {len(excitations)}\n")
 
     # Wire geometry lines
     # Format: X1 Y1 Z1 X2 Y2 Z2 Radius N_segments
-    for wire in wires:
-        lines.append(
-            f"{wire.x1:.6f}, {wire.y1:.6f}, {wire.z1:.6f}, "
-            f"{wire.x2:.6f}, {wire.y2:.6f}, {wire.z2:.6f}, "
-            f"{wire.radius:.6f}, {wire.segments}"
-        )
+    buf.writelines(
+        _WIRE_FMT % (w.x1, w.y1, w.z1, w.x2, w.y2, w.z2, w.radius, w.segments)
+        for w in wires
+    )
 
     # Load lines
     # Format: Wire_num Seg_num R X L C
     for load in loads:
-        if load.load_type == LoadType.SERIES_RLC:
-            lines.append(
-                f"{load.wire_tag}, {load.segment_start}, "
-                f"{load.param1:.6g}, 0, {load.param2:.6g}, {load.param3:.6g}"
-            )
-        elif load.load_type == LoadType.FIXED_IMPEDANCE:
-            lines.append(
-                f"{load.wire_tag}, {load.segment_start}, "
-                f"{load.param1:.6g}, {load.param2:.6g}, 0, 0"
-            )
-        else:
-            # Wire conductivity and parallel RLC don't map cleanly to .maa
-            lines.append(
-                f"{load.wire_tag}, {load.segment_start}, "
-                f"{load.param1:.6g}, {load.param2:.6g}, {load.param3:.6g}, 0"
-            )
+        fmt, n_args = _LOAD_FMTS.get(load.load_type, _LOAD_OTHER_FMT)
+        args = (load.wire_tag, load.segment_start, load.param1, load.param2, load.param3)
+        write(fmt % args[:n_args])
 
     # Source lines
     # Format: Wire_num Seg_num Voltage_mag Voltage_phase
-    for ex in excitations:
-        v_mag = math.sqrt(ex.voltage_real ** 2 + ex.voltage_imag ** 2)
-        v_phase = math.degrees(math.atan2(ex.voltage_imag, ex.voltage_real))
-        lines.append(
-            f"{ex.wire_tag}, {ex.segment}, {v_mag:.6f}, {v_phase:.2f}"
-        )
+    v_mags, v_phases = _source_polar(excitations)
+    buf.writelines(
+        _SRC_FMT % (ex.wire_tag, ex.segment, v_mag, v_phase)
+        for ex, v_mag, v_phase in zip(excitations, v_mags, v_phases)
+    )
 
     # Ground section (simplified — MMANA format varies)
-    lines.append("1")  # Ground type: 1 = real ground
-    lines.append("13.0, 0.005")  # Average ground parameters
+    write("1\n")  # Ground type: 1 = real ground
+    write("13.0, 0.005\n")  # Average ground parameters
 
     # End marker
-    lines.append("")
+    write("\n")
 
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
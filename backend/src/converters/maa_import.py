@@ -16,6 +16,7 @@ The .maa format actually stores coordinates in meters.
 
 import logging
 import math
+import re
 
 from src.models.antenna import Wire, Excitation, LumpedLoad, LoadType
 from src.models.ground import GroundConfig, GroundType
@@ -23,6 +24,15 @@ from src.models.limits import MAX_FREQUENCY_MHZ, MIN_FREQUENCY_MHZ
 
 logger = logging.getLogger("antsim.converters.maa_import")
 
+# Tokenize a data row on commas and/or whitespace in a single regex pass
+_MAA_TOKENS = re.compile(r"[^,\s]+").findall
+
+# Frequency / ground keywords in the trailing lines, found case-insensitively in one scan
+_TAIL_HINT_RE = re.compile(
+    r"(?P<mhz>mhz)|(?P<free>free)|(?P<space>space)|(?P<perfect>perfect)|(?P<avg>real|average)",
+    re.IGNORECASE,
+)
+
 
 class MAAParseError(Exception):
     """Error parsing .maa file."""
@@ -54,7 +64,7 @@ def parse_maa(content: str) -> MAAData:
         MAAParseError: If the file format is invalid.
     """
     data = MAAData()
-    lines = content.strip().replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    lines = content.strip().splitlines()
 
     if len(lines) < 3:
         raise MAAParseError("File too short — expected at least title, counts, and geometry")
@@ -104,19 +114,14 @@ def parse_maa(content: str) -> MAAData:
         line = lines[idx].strip()
         idx += 1
 
-        parts = line.replace(",", " ").split()
+        parts = _MAA_TOKENS(line)
         if len(parts) < 8:
             raise MAAParseError(f"Wire {i + 1}: expected 8 values, got {len(parts)}: {line}")
 
         try:
-            x1 = float(parts[0])
-            y1 = float(parts[1])
-            z1 = float(parts[2])
-            x2 = float(parts[3])
-            y2 = float(parts[4])
-            z2 = float(parts[5])
-            radius = float(parts[6])
-            segments = int(float(parts[7]))  # sometimes float in file
+            # Convert all 8 fields in one C-level map pass
+            x1, y1, z1, x2, y2, z2, radius, seg_f = map(float, parts[:8])
+            segments = int(seg_f)  # sometimes float in file
 
             # Clamp segments
             segments = max(1, min(200, segments))
@@ -143,7 +148,7 @@ def parse_maa(content: str) -> MAAData:
         line = lines[idx].strip()
         idx += 1
 
-        parts = line.replace(",", " ").split()
+        parts = _MAA_TOKENS(line)
         if len(parts) < 4:
             continue
 
@@ -191,7 +196,7 @@ def parse_maa(content: str) -> MAAData:
         line = lines[idx].strip()
         idx += 1
 
-        parts = line.replace(",", " ").split()
+        parts = _MAA_TOKENS(line)
         if len(parts) < 2:
             continue
 
@@ -225,11 +230,12 @@ def parse_maa(content: str) -> MAAData:
 
     # Try to parse ground and frequency from remaining lines
     while idx < len(lines):
-        line = lines[idx].strip().lower()
+        line = lines[idx].strip()
         idx += 1
+        hints = {m.lastgroup for m in _TAIL_HINT_RE.finditer(line)}
 
         # Look for frequency info
-        if "mhz" in line or line.replace(".", "").replace("-", "").isdigit():
+        if "mhz" in hints or line.replace(".", "").replace("-", "").isdigit():
             try:
                 freq = float(line.split()[0].replace(",", ""))
                 if MIN_FREQUENCY_MHZ <= freq <= MAX_FREQUENCY_MHZ:
@@ -238,11 +244,11 @@ def parse_maa(content: str) -> MAAData:
                 pass
 
         # Look for ground type hints
-        if "free" in line and "space" in line:
+        if "free" in hints and "space" in hints:
             data.ground = GroundConfig(ground_type=GroundType.FREE_SPACE)
-        elif "perfect" in line:
+        elif "perfect" in hints:
             data.ground = GroundConfig(ground_type=GroundType.PERFECT)
-        elif "real" in line or "average" in line:
+        elif "avg" in hints:
             data.ground = GroundConfig(ground_type=GroundType.AVERAGE)
 
     return data
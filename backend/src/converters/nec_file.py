@@ -6,6 +6,8 @@ Export: Generate .nec card deck from models (uses nec_input.build_card_deck)
 
 import ast
 import logging
+import sys
+from collections.abc import Callable
 
 from src.models.antenna import Wire, Excitation, LumpedLoad, LoadType, TransmissionLine
 from src.models.ground import GroundConfig, GroundType
@@ -108,6 +110,15 @@ def _parse_float_token(token: str, symbols: dict[str, float]) -> float:
         return _eval_numeric_expression(token, symbols)
 
 
+def _safe_float_token(token: str, symbols: dict[str, float], line: str) -> float:
+    """Parse a float token, logging and falling back to 0.0 on failure."""
+    try:
+        return _parse_float_token(token, symbols)
+    except (ValueError, ZeroDivisionError, OverflowError) as e:
+        logger.warning("Failed to parse numeric token '%s' in line '%s': %s", token, line, e)
+        return 0.0
+
+
 def _parse_floats(
     parts: list[str],
     start: int,
@@ -115,20 +126,226 @@ def _parse_floats(
     symbols: dict[str, float],
     line: str,
 ) -> list[float]:
-    """Parse `count` floats from `parts` starting at index `start`."""
-    result: list[float] = []
-    for i in range(start, start + count):
-        if i < len(parts):
-            try:
-                result.append(_parse_float_token(parts[i], symbols))
-            except (ValueError, ZeroDivisionError, OverflowError) as e:
-                logger.warning("Failed to parse numeric token '%s' in line '%s': %s", parts[i], line, e)
-                result.append(0.0)
-        else:
-            result.append(0.0)
+    """Parse `count` floats from `parts` starting at index `start` (missing -> 0.0)."""
+    tokens = parts[start:start + count]
+    try:
+        # Fast path: plain numeric literals convert in one C-level map
+        result = list(map(float, tokens))
+    except ValueError:
+        result = [_safe_float_token(token, symbols, line) for token in tokens]
+    if len(result) < count:
+        result.extend([0.0] * (count - len(result)))
     return result
 
 
+# ---- Card handlers ----
+# Each takes (parts, line, data, symbols) for one card and updates `data`.
+
+def _parse_sy(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Symbol assignment: SY NAME=EXPR
+    # Common in 4NEC2-generated files.
+    body = line[2:].strip()
+    if "'" in body:
+        body = body.split("'", 1)[0].strip()
+    assignments = [item.strip() for item in body.split(",") if item.strip()]
+    if not assignments:
+        logger.warning("SY card missing assignments: %s", line)
+        return
+    for assignment in assignments:
+        if "=" not in assignment:
+            logger.warning("SY assignment missing '=': %s", assignment)
+            continue
+        name_raw, expr_raw = assignment.split("=", 1)
+        name = name_raw.strip().upper()
+        expr = expr_raw.strip()
+        if not name:
+            logger.warning("SY assignment with empty symbol name: %s", assignment)
+            continue
+        try:
+            symbols[name] = _parse_float_token(expr, symbols)
+        except (ValueError, ZeroDivisionError, OverflowError) as e:
+            logger.warning("Failed to parse SY assignment '%s': %s", assignment, e)
+
+
+def _parse_gw(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Wire: GW TAG SEGMENTS X1 Y1 Z1 X2 Y2 Z2 RADIUS
+    n = len(parts)
+    if n < 10:
+        logger.warning("GW card too short: %s", line)
+        return
+    try:
+        tag = int(parts[1])
+        segments = int(parts[2])
+        vals = _parse_floats(parts, 3, 7, symbols, line)
+
+        wire = Wire(
+            tag=tag,
+            segments=max(1, min(200, segments)),
+            x1=vals[0], y1=vals[1], z1=vals[2],
+            x2=vals[3], y2=vals[4], z2=vals[5],
+            radius=max(0.0001, min(0.1, vals[6])),
+        )
+        data.wires.append(wire)
+    except (ValueError, IndexError) as e:
+        logger.warning("Failed to parse GW: %s — %s", line, e)
+
+
+def _parse_gn(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Ground: GN TYPE ...
+    n = len(parts)
+    if n < 2:
+        return
+    try:
+        gn_type = int(parts[1])
+        if gn_type == -1:
+            data.ground = GroundConfig(ground_type=GroundType.FREE_SPACE)
+        elif gn_type == 1:
+            data.ground = GroundConfig(ground_type=GroundType.PERFECT)
+        elif gn_type == 2:
+            eps_r = _parse_float_token(parts[5], symbols) if n > 5 else 13.0
+            sigma = _parse_float_token(parts[6], symbols) if n > 6 else 0.005
+            data.ground = GroundConfig(
+                ground_type=GroundType.CUSTOM,
+                dielectric_constant=eps_r,
+                conductivity=sigma,
+            )
+    except (ValueError, IndexError, OverflowError):
+        pass
+
+
+def _parse_ex(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Excitation: EX TYPE TAG SEGMENT 0 V_REAL V_IMAG
+    n = len(parts)
+    if n < 4:
+        return
+    try:
+        ex_type = int(parts[1])
+        if ex_type != 0:
+            return  # Only voltage sources for now
+        tag = int(parts[2])
+        segment = int(parts[3])
+        v_real = _parse_float_token(parts[5], symbols) if n > 5 else 1.0
+        v_imag = _parse_float_token(parts[6], symbols) if n > 6 else 0.0
+        data.excitations.append(
+            Excitation(
+                wire_tag=tag,
+                segment=segment,
+                voltage_real=v_real,
+                voltage_imag=v_imag,
+            )
+        )
+    except (ValueError, IndexError, OverflowError):
+        pass
+
+
+# NEC2 LD type number -> LoadType, resolved with a dict lookup per card
+_LD_TYPE_MAP: dict[int, LoadType] = {t.value: t for t in LoadType}
+
+
+def _parse_ld(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Load: LD TYPE TAG SEG_START SEG_END P1 P2 P3
+    n = len(parts)
+    if n < 5:
+        return
+    try:
+        ld_type = int(parts[1])
+        tag = int(parts[2])
+        seg_s = int(parts[3])
+        seg_e = int(parts[4])
+        p1 = _parse_float_token(parts[5], symbols) if n > 5 else 0.0
+        p2 = _parse_float_token(parts[6], symbols) if n > 6 else 0.0
+        p3 = _parse_float_token(parts[7], symbols) if n > 7 else 0.0
+
+        # Map NEC2 LD types to our enum (other types are not supported)
+        load_type = _LD_TYPE_MAP.get(ld_type)
+        if load_type is not None:
+            data.loads.append(
+                LumpedLoad(
+                    load_type=load_type,
+                    wire_tag=tag,
+                    segment_start=seg_s,
+                    segment_end=seg_e,
+                    param1=p1,
+                    param2=p2,
+                    param3=p3,
+                )
+            )
+    except (ValueError, IndexError, OverflowError):
+        pass
+
+
+def _parse_tl(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Transmission Line: TL TAG1 SEG1 TAG2 SEG2 Z0 LENGTH ...
+    n = len(parts)
+    if n < 7:
+        return
+    try:
+        tag1 = int(parts[1])
+        seg1 = int(parts[2])
+        tag2 = int(parts[3])
+        seg2 = int(parts[4])
+        z0 = _parse_float_token(parts[5], symbols)
+        length = _parse_float_token(parts[6], symbols)
+        ya_r1 = _parse_float_token(parts[7], symbols) if n > 7 else 0.0
+        ya_i1 = _parse_float_token(parts[8], symbols) if n > 8 else 0.0
+        ya_r2 = _parse_float_token(parts[9], symbols) if n > 9 else 0.0
+        ya_i2 = _parse_float_token(parts[10], symbols) if n > 10 else 0.0
+
+        data.transmission_lines.append(
+            TransmissionLine(
+                wire_tag1=tag1,
+                segment1=seg1,
+                wire_tag2=tag2,
+                segment2=seg2,
+                impedance=max(1.0, min(1000.0, z0)),
+                length=max(0.0, min(1000.0, length)),
+                shunt_admittance_real1=ya_r1,
+                shunt_admittance_imag1=ya_i1,
+                shunt_admittance_real2=ya_r2,
+                shunt_admittance_imag2=ya_i2,
+            )
+        )
+    except (ValueError, IndexError, OverflowError):
+        pass
+
+
+def _parse_fr(parts: list[str], line: str, data: NECFileData, symbols: dict[str, float]) -> None:
+    # Frequency: FR TYPE NFREQ 0 0 START_MHZ STEP_MHZ
+    n = len(parts)
+    if n < 6:
+        return
+    try:
+        n_freq = int(parts[2])
+        start = _parse_float_token(parts[5], symbols)
+        step = _parse_float_token(parts[6], symbols) if n > 6 else 0.0
+
+        data.frequency_start_mhz = max(MIN_FREQUENCY_MHZ, min(MAX_FREQUENCY_MHZ, start))
+        data.frequency_steps = max(1, min(201, n_freq))
+        if n_freq > 1 and step > 0:
+            data.frequency_stop_mhz = max(
+                data.frequency_start_mhz,
+                min(MAX_FREQUENCY_MHZ, start + step * (n_freq - 1)),
+            )
+        else:
+            data.frequency_stop_mhz = data.frequency_start_mhz
+    except (ValueError, IndexError, OverflowError):
+        pass
+
+
+_CardHandler = Callable[[list[str], str, NECFileData, dict[str, float]], None]
+
+# Card mnemonic -> handler; one dict lookup per line instead of an if/elif chain
+_CARD_HANDLERS: dict[str, _CardHandler] = {
+    "SY": _parse_sy,
+    "GW": _parse_gw,
+    "GN": _parse_gn,
+    "EX": _parse_ex,
+    "LD": _parse_ld,
+    "TL": _parse_tl,
+    "FR": _parse_fr,
+}
+
+
 def parse_nec_file(content: str) -> NECFileData:
     """Parse a NEC2 .nec card deck file into structured data.
 
@@ -145,7 +362,7 @@ def parse_nec_file(content: str) -> NECFileData:
         NECParseError: If the file format is fundamentally invalid.
     """
     data = NECFileData()
-    lines = content.strip().replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    lines = content.strip().splitlines()
 
     comments: list[str] = []
     sy_symbols: dict[str, float] = {}
@@ -162,189 +379,22 @@ def parse_nec_file(content: str) -> NECFileData:
         if not parts:
             continue
 
-        card = parts[0].upper()
-
-        if card == "CM":
-            # Comment
-            comments.append(line[2:].strip() if len(line) > 2 else "")
-
-        elif card == "SY":
-            # Symbol assignment: SY NAME=EXPR
-            # Common in 4NEC2-generated files.
-            body = line[2:].strip()
-            if "'" in body:
-                body = body.split("'", 1)[0].strip()
-            assignments = [item.strip() for item in body.split(",") if item.strip()]
-            if not assignments:
-                logger.warning("SY card missing assignments: %s", line)
-                continue
-            for assignment in assignments:
-                if "=" not in assignment:
-                    logger.warning("SY assignment missing '=': %s", assignment)
-                    continue
-                name_raw, expr_raw = assignment.split("=", 1)
-                name = name_raw.strip().upper()
-                expr = expr_raw.strip()
-                if not name:
-                    logger.warning("SY assignment with empty symbol name: %s", assignment)
-                    continue
-                try:
-                    sy_symbols[name] = _parse_float_token(expr, sy_symbols)
-                except (ValueError, ZeroDivisionError, OverflowError) as e:
-                    logger.warning("Failed to parse SY assignment '%s': %s", assignment, e)
+        # Interned so the handler lookup and CM/CE/EN checks below compare by
+        # identity against the (already interned) mnemonic literals
+        card = sys.intern(parts[0].upper())
+
+        handler = _CARD_HANDLERS.get(card)
+        if handler is not None:
+            handler(parts, line, data, sy_symbols)
+
+        elif card == "CM":
+            # Comment (line is already stripped, only the gap after "CM" remains)
+            comments.append(line[2:].lstrip())
 
         elif card == "CE":
             # Comment end
             data.comment = " ".join(comments).strip()
 
-        elif card == "GW":
-            # Wire: GW TAG SEGMENTS X1 Y1 Z1 X2 Y2 Z2 RADIUS
-            if len(parts) < 10:
-                logger.warning("GW card too short: %s", line)
-                continue
-            try:
-                tag = int(parts[1])
-                segments = int(parts[2])
-                vals = _parse_floats(parts, 3, 7, sy_symbols, line)
-
-                wire = Wire(
-                    tag=tag,
-                    segments=max(1, min(200, segments)),
-                    x1=vals[0], y1=vals[1], z1=vals[2],
-                    x2=vals[3], y2=vals[4], z2=vals[5],
-                    radius=max(0.0001, min(0.1, vals[6])),
-                )
-                data.wires.append(wire)
-            except (ValueError, IndexError) as e:
-                logger.warning("Failed to parse GW: %s — %s", line, e)
-
-        elif card == "GN":
-            # Ground: GN TYPE ...
-            if len(parts) < 2:
-                continue
-            try:
-                gn_type = int(parts[1])
-                if gn_type == -1:
-                    data.ground = GroundConfig(ground_type=GroundType.FREE_SPACE)
-                elif gn_type == 1:
-                    data.ground = GroundConfig(ground_type=GroundType.PERFECT)
-                elif gn_type == 2:
-                    eps_r = _parse_float_token(parts[5], sy_symbols) if len(parts) > 5 else 13.0
-                    sigma = _parse_float_token(parts[6], sy_symbols) if len(parts) > 6 else 0.005
-                    data.ground = GroundConfig(
-                        ground_type=GroundType.CUSTOM,
-                        dielectric_constant=eps_r,
-                        conductivity=sigma,
-                    )
-            except (ValueError, IndexError, OverflowError):
-                pass
-
-        elif card == "EX":
-            # Excitation: EX TYPE TAG SEGMENT 0 V_REAL V_IMAG
-            if len(parts) < 4:
-                continue
-            try:
-                ex_type = int(parts[1])
-                if ex_type != 0:
-                    continue  # Only voltage sources for now
-                tag = int(parts[2])
-                segment = int(parts[3])
-                v_real = _parse_float_token(parts[5], sy_symbols) if len(parts) > 5 else 1.0
-                v_imag = _parse_float_token(parts[6], sy_symbols) if len(parts) > 6 else 0.0
-                data.excitations.append(
-                    Excitation(
-                        wire_tag=tag,
-                        segment=segment,
-                        voltage_real=v_real,
-                        voltage_imag=v_imag,
-                    )
-                )
-            except (ValueError, IndexError, OverflowError):
-                pass
-
-        elif card == "LD":
-            # Load: LD TYPE TAG SEG_START SEG_END P1 P2 P3
-            if len(parts) < 5:
-                continue
-            try:
-                ld_type = int(parts[1])
-                tag = int(parts[2])
-                seg_s = int(parts[3])
-                seg_e = int(parts[4])
-                p1 = _parse_float_token(parts[5], sy_symbols) if len(parts) > 5 else 0.0
-                p2 = _parse_float_token(parts[6], sy_symbols) if len(parts) > 6 else 0.0
-                p3 = _parse_float_token(parts[7], sy_symbols) if len(parts) > 7 else 0.0
-
-                # Map NEC2 LD types to our enum
-                if ld_type in (0, 1, 4, 5):
-                    data.loads.append(
-                        LumpedLoad(
-                            load_type=LoadType(ld_type),
-                            wire_tag=tag,
-                            segment_start=seg_s,
-                            segment_end=seg_e,
-                            param1=p1,
-                            param2=p2,
-                            param3=p3,
-                        )
-                    )
-            except (ValueError, IndexError, OverflowError):
-                pass
-
-        elif card == "TL":
-            # Transmission Line: TL TAG1 SEG1 TAG2 SEG2 Z0 LENGTH ...
-            if len(parts) < 7:
-                continue
-            try:
-                tag1 = int(parts[1])
-                seg1 = int(parts[2])
-                tag2 = int(parts[3])
-                seg2 = int(parts[4])
-                z0 = _parse_float_token(parts[5], sy_symbols)
-                length = _parse_float_token(parts[6], sy_symbols)
-                ya_r1 = _parse_float_token(parts[7], sy_symbols) if len(parts) > 7 else 0.0
-                ya_i1 = _parse_float_token(parts[8], sy_symbols) if len(parts) > 8 else 0.0
-                ya_r2 = _parse_float_token(parts[9], sy_symbols) if len(parts) > 9 else 0.0
-                ya_i2 = _parse_float_token(parts[10], sy_symbols) if len(parts) > 10 else 0.0
-
-                data.transmission_lines.append(
-                    TransmissionLine(
-                        wire_tag1=tag1,
-                        segment1=seg1,
-                        wire_tag2=tag2,
-                        segment2=seg2,
-                        impedance=max(1.0, min(1000.0, z0)),
-                        length=max(0.0, min(1000.0, length)),
-                        shunt_admittance_real1=ya_r1,
-                        shunt_admittance_imag1=ya_i1,
-                        shunt_admittance_real2=ya_r2,
-                        shunt_admittance_imag2=ya_i2,
-                    )
-                )
-            except (ValueError, IndexError, OverflowError):
-                pass
-
-        elif card == "FR":
-            # Frequency: FR TYPE NFREQ 0 0 START_MHZ STEP_MHZ
-            if len(parts) < 6:
-                continue
-            try:
-                n_freq = int(parts[2])
-                start = _parse_float_token(parts[5], sy_symbols)
-                step = _parse_float_token(parts[6], sy_symbols) if len(parts) > 6 else 0.0
-
-                data.frequency_start_mhz = max(MIN_FREQUENCY_MHZ, min(MAX_FREQUENCY_MHZ, start))
-                data.frequency_steps = max(1, min(201, n_freq))
-                if n_freq > 1 and step > 0:
-                    data.frequency_stop_mhz = max(
-                        data.frequency_start_mhz,
-                        min(MAX_FREQUENCY_MHZ, start + step * (n_freq - 1)),
-                    )
-                else:
-                    data.frequency_stop_mhz = data.frequency_start_mhz
-            except (ValueError, IndexError, OverflowError):
-                pass
-
         elif card == "EN":
             break  # End of input
 
@@ -0,0 +1,85 @@
+"""Reject oversized request bodies before they are read or validated.
+
+Limit is configured via MAX_BODY_BYTES (see config.py, default 4 MB).
+Returns 413 Payload Too Large based on the Content-Length header, so an
+abusive payload never reaches the JSON parser or pydantic validation.
+Bodies without a Content-Length (chunked) are counted as they are read
+and cut off with the same 413 once they pass the limit.
+"""
+
+import logging
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("antsim.body_limit")
+
+
+class _BodyTooLargeError(Exception):
+    """Raised from receive() once a body without Content-Length passes the limit."""
+
+
+class BodySizeLimitMiddleware:
+    """Pure ASGI middleware returning 413 when a request body exceeds max_bytes."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(scope, receive, send, f"{value.decode()} bytes")
+                    return
+                # The server holds the body to its Content-Length: nothing to count
+                await self.app(scope, receive, send)
+                return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    too_large = True
+                    raise _BodyTooLargeError
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if too_large and not response_started:
+                return  # The app's error for the cut-off body; the 413 replaces it
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLargeError:
+            if response_started:
+                raise
+        if too_large and not response_started:
+            await self._reject(scope, receive, send, f"at least {received} bytes")
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, size: str) -> None:
+        logger.warning(
+            "Rejected %s %s: body of %s exceeds %d",
+            scope["method"], scope["path"], size, self.max_bytes,
+        )
+        response = JSONResponse(
+            status_code=413,
+            content={
+                "error": "payload_too_large",
+                "message": f"Request body exceeds {self.max_bytes} bytes",
+            },
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,25 @@
+"""CORS middleware with constant-time origin checks.
+
+Origins come from ALLOWED_ORIGINS (see config.py) and never change at
+runtime, so they are frozen into a set once instead of being scanned as a
+list on every cross-origin request.
+"""
+
+from typing import Any
+
+from starlette.middleware.cors import CORSMiddleware
+
+
+class OriginSetCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware whose explicit-origin check is a frozenset lookup."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._origin_set = frozenset(self.allow_origins)
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins or origin in self._origin_set:
+            return True
+        return self.allow_origin_regex is not None and bool(
+            self.allow_origin_regex.fullmatch(origin)
+        )
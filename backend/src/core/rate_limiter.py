@@ -1,4 +1,4 @@
-"""Redis sliding window rate limiter.
+"""Redis sliding window rate limiter (two-bucket approximation).
 
 Limits are configured via environment variables (see config.py):
   - RATE_LIMIT_ENABLED (default: false)
@@ -7,37 +7,154 @@ Limits are configured via environment variables (see config.py):
   - MAX_CONCURRENT_PER_IP (default: 5)
 
 Returns 429 Too Many Requests with Retry-After header on limit.
+Endpoints opt in by using RateLimitedRoute as their router's route_class.
 """
 
+import asyncio
 import logging
+import math
 import time
+from collections.abc import Callable, Coroutine
+from typing import Any
 
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, Response
+from fastapi.routing import APIRoute
 
+import orjson
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 
 from src.config import settings
 from src.simulation.cache import get_redis
 
 logger = logging.getLogger("antsim.rate_limiter")
 
+# Approximate sliding window over two fixed-window counters: the previous
+# window's count is weighted by how much of it still overlaps the sliding
+# window. Checked and recorded atomically server-side in one round trip.
+# KEYS: current window counter, previous window counter, concurrent key
+# ARGV: previous window weight, rate limit, counter TTL, concurrent limit,
+#       concurrent key TTL
+# Returns {0} if admitted, {1, previous, current} if over the hourly limit,
+# or {2, concurrent_count} if over the concurrent limit.
+_RATE_LIMIT_LUA = """
+local curr = tonumber(redis.call('GET', KEYS[1]) or '0')
+local prev = tonumber(redis.call('GET', KEYS[2]) or '0')
+if prev * tonumber(ARGV[1]) + curr >= tonumber(ARGV[2]) then
+    return {1, prev, curr}
+end
+local concurrent = tonumber(redis.call('GET', KEYS[3]) or '0')
+if concurrent >= tonumber(ARGV[4]) then
+    return {2, concurrent}
+end
+-- Window counters only ever grow, so the TTL is set once, on creation
+if redis.call('INCR', KEYS[1]) == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[5])
+return {0}
+"""
+
+# Concurrent-slot release, clamped at zero in the same round trip.
+# KEYS: concurrent key
+# ARGV: concurrent key TTL
+_RELEASE_LUA = """
+local v = redis.call('DECR', KEYS[1])
+if v < 0 then
+    redis.call('SET', KEYS[1], 0, 'EX', ARGV[1])
+    return 0
+end
+return v
+"""
+
+# Strong references to in-flight background writes (the loop only keeps weak ones)
+_background_tasks: set[asyncio.Task[None]] = set()
+
+_rate_limit_script: AsyncScript | None = None
+_release_script: AsyncScript | None = None
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> None:
+    """Run a Redis write in the background, off the request path."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def wait_background_tasks() -> None:
+    """Let background rate-limit writes finish (e.g. before shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
+def _get_rate_limit_script(r: redis.Redis) -> AsyncScript:
+    """Register the rate-limit script once; calls go through EVALSHA."""
+    global _rate_limit_script
+    if _rate_limit_script is None:
+        _rate_limit_script = r.register_script(_RATE_LIMIT_LUA)
+    return _rate_limit_script
+
+
+def _get_release_script(r: redis.Redis) -> AsyncScript:
+    """Register the release script once; calls go through EVALSHA."""
+    global _release_script
+    if _release_script is None:
+        _release_script = r.register_script(_RELEASE_LUA)
+    return _release_script
+
+
+async def load_rate_limit_script(r: redis.Redis) -> None:
+    """SCRIPT LOAD the rate-limit scripts at startup.
+
+    The first rate-limited request then goes straight to EVALSHA instead of
+    paying a NOSCRIPT miss plus a load on the request path.
+    """
+    try:
+        for script in (_get_rate_limit_script(r), _get_release_script(r)):
+            script.sha = await r.script_load(script.script)
+    except Exception as e:
+        logger.warning("Failed to preload rate-limit scripts: %s", e)
+
 
 def _get_client_ip(request: Request) -> str:
-    """Extract client IP, respecting X-Forwarded-For behind reverse proxy."""
+    """Extract client IP, respecting X-Forwarded-For behind reverse proxy.
+
+    Memoized on request.state so the check and the release parse it only once.
+    """
+    ip: str | None = getattr(request.state, "client_ip", None)
+    if ip is not None:
+        return ip
     forwarded = request.headers.get("x-forwarded-for")
     if forwarded:
         # Take the first (client) IP from the chain
-        return forwarded.split(",")[0].strip()
-    client = request.client
-    if client:
-        return client.host
-    return "unknown"
+        ip = forwarded.split(",")[0].strip()
+    elif request.client:
+        ip = request.client.host
+    else:
+        ip = "unknown"
+    request.state.client_ip = ip
+    return ip
+
+
+def _client_keys(request: Request) -> tuple[bytes, bytes]:
+    """Return (rate key prefix, concurrent key) for the client as bytes.
+
+    Built once per request and kept on request.state for the release.
+    """
+    keys: tuple[bytes, bytes] | None = getattr(request.state, "rate_limit_keys", None)
+    if keys is None:
+        ip = _get_client_ip(request).encode()
+        keys = (b"rate:" + ip + b":", b"concurrent:" + ip)
+        request.state.rate_limit_keys = keys
+    return keys
 
 
 async def check_rate_limit(request: Request) -> None:
     """Check rate limits and raise HTTPException(429) if exceeded.
 
-    Uses Redis sorted sets with timestamps as scores for a sliding window.
+    Uses two fixed-window INCR counters per IP to approximate a sliding
+    window, checked and recorded atomically by a Lua script.
     Falls back to allowing requests if Redis is unavailable.
     Bypassed entirely when rate_limit_enabled is False (default).
     """
@@ -50,35 +167,46 @@ async def check_rate_limit(request: Request) -> None:
         return
 
     client_ip = _get_client_ip(request)
-    now = time.time()
-    window_start = now - settings.rate_limit_window_seconds
+    rate_prefix, concurrent_key = _client_keys(request)
+    window = settings.rate_limit_window_seconds
+    window_f, elapsed = divmod(time.time(), window)
+    window_id = int(window_f)
+    # Fraction of the previous window still inside the sliding window
+    prev_weight = 1.0 - elapsed / window
 
-    rate_key = f"rate:{client_ip}"
-    concurrent_key = f"concurrent:{client_ip}"
+    rate_key = rate_prefix + b"%d" % window_id
+    prev_rate_key = rate_prefix + b"%d" % (window_id - 1)
 
     try:
-        pipe = r.pipeline()
-
-        # Remove expired entries from the sliding window
-        pipe.zremrangebyscore(rate_key, 0, window_start)
-        # Count requests in current window
-        pipe.zcard(rate_key)
-        # Check concurrent count
-        pipe.get(concurrent_key)
-
-        results = await pipe.execute()
-        request_count: int = results[1]
-        concurrent_raw = results[2]
-        concurrent_count = int(concurrent_raw) if concurrent_raw else 0
+        script = _get_rate_limit_script(r)
+        result = await script(
+            keys=[rate_key, prev_rate_key, concurrent_key],
+            args=[
+                repr(prev_weight),
+                settings.rate_limit_per_hour,
+                2 * window + 60,  # Still needed as the next window's "previous"
+                settings.max_concurrent_per_ip,
+                120,  # Auto-expire the concurrent counter in case of crash
+            ],
+            client=r,
+        )
+        status = int(result[0])
+        if status == 0:
+            return
 
         # Check hourly rate limit
-        if request_count >= settings.rate_limit_per_hour:
-            # Find the oldest entry to compute retry-after
-            oldest = await r.zrange(rate_key, 0, 0, withscores=True)
-            retry_after = settings.rate_limit_window_seconds
-            if oldest:
-                oldest_time = oldest[0][1]
-                retry_after = max(1, int(oldest_time + settings.rate_limit_window_seconds - now))
+        if status == 1:
+            prev_count = int(result[1])
+            curr_count = int(result[2])
+            request_count = int(prev_count * prev_weight + curr_count)
+            limit = settings.rate_limit_per_hour
+            if curr_count >= limit or prev_count == 0:
+                # Blocked until the current window rolls over
+                wait = window - elapsed
+            else:
+                # Blocked until the previous window's weight decays below the headroom
+                wait = window * (1.0 - (limit - curr_count) / prev_count) - elapsed
+            retry_after = max(1, math.ceil(wait))
 
             logger.warning(
                 "Rate limit exceeded for %s: %d requests in window",
@@ -95,7 +223,8 @@ async def check_rate_limit(request: Request) -> None:
             )
 
         # Check concurrent limit
-        if concurrent_count >= settings.max_concurrent_per_ip:
+        if status == 2:
+            concurrent_count = int(result[1])
             logger.warning(
                 "Concurrent limit exceeded for %s: %d active",
                 client_ip, concurrent_count,
@@ -110,14 +239,6 @@ async def check_rate_limit(request: Request) -> None:
                 headers={"Retry-After": "5"},
             )
 
-        # Record this request in the sliding window
-        await r.zadd(rate_key, {f"{now}": now})
-        await r.expire(rate_key, settings.rate_limit_window_seconds + 60)
-
-        # Increment concurrent counter
-        await r.incr(concurrent_key)
-        await r.expire(concurrent_key, 120)  # Auto-expire in case of crash
-
     except HTTPException:
         raise
     except Exception as e:
@@ -130,13 +251,43 @@ async def release_concurrent(request: Request) -> None:
     if r is None:
         return
 
-    client_ip = _get_client_ip(request)
-    concurrent_key = f"concurrent:{client_ip}"
+    _, concurrent_key = _client_keys(request)
 
     try:
-        val = await r.decr(concurrent_key)
-        # Don't let it go negative
-        if val < 0:
-            await r.set(concurrent_key, 0, ex=120)
+        # Decrement and clamp at zero in one round trip
+        await _get_release_script(r)(keys=[concurrent_key], args=[120], client=r)
     except Exception as e:
         logger.warning("Failed to release concurrent counter: %s", e)
+
+
+class RateLimitedRoute(APIRoute):
+    """APIRoute that enforces rate limits before the request body is read.
+
+    Rejected clients get their 429 without the body being parsed or
+    validated, and the concurrent slot is held for the rest of the request.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        if not settings.rate_limit_enabled:
+            # Settings are fixed for the process: no per-request check or release
+            return handler
+
+        async def rate_limited_handler(request: Request) -> Response:
+            try:
+                await check_rate_limit(request)
+            except HTTPException as exc:
+                # Same body as FastAPI's HTTPException handler, encoded by orjson
+                return Response(
+                    orjson.dumps({"detail": exc.detail}),
+                    status_code=exc.status_code,
+                    headers=exc.headers,
+                    media_type="application/json",
+                )
+            try:
+                return await handler(request)
+            finally:
+                # Always release the concurrent counter, off the response path
+                _spawn(release_concurrent(request))
+
+        return rate_limited_handler
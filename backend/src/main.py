@@ -5,12 +5,15 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import settings
 from src.api.router import api_router
+from src.core.body_limit import BodySizeLimitMiddleware
+from src.core.cors import OriginSetCORSMiddleware
 from src.core.exceptions import register_exception_handlers
+from src.core.rate_limiter import load_rate_limit_script, wait_background_tasks
 from src.simulation.cache import get_redis, close_redis
+from src.simulation.nec_runner import NEC2C_PATH
 
 logger = logging.getLogger("antsim")
 
@@ -25,25 +28,27 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("AntennaSim backend starting — env=%s", settings.environment)
     logger.info("CORS origins: %s", settings.cors_origins)
 
-    # Verify nec2c is available
-    import shutil
-
-    nec2c_path = shutil.which("nec2c")
-    if nec2c_path:
-        logger.info("nec2c found at: %s", nec2c_path)
+    # Verify nec2c is available (resolved once when nec_runner was imported)
+    if NEC2C_PATH:
+        logger.info("nec2c found at: %s", NEC2C_PATH)
     else:
         logger.warning("nec2c NOT found in PATH — simulations will fail")
 
-    # Initialize Redis connection
+    # Initialize Redis connection once and share it through app.state
     redis_conn = await get_redis()
+    app.state.redis = redis_conn
     if redis_conn:
         logger.info("Redis cache enabled")
+        if settings.rate_limit_enabled:
+            await load_rate_limit_script(redis_conn)
     else:
         logger.warning("Redis unavailable — caching and rate limiting disabled")
 
     yield
 
     # Shutdown: close Redis
+    await wait_background_tasks()
+    app.state.redis = None
     await close_redis()
     logger.info("AntennaSim backend shutting down")
 
@@ -60,9 +65,13 @@ app = FastAPI(
 # Register custom exception handlers
 register_exception_handlers(app)
 
+# Reject oversized bodies before they are parsed (added before CORS so the
+# 413 still carries CORS headers and the browser can read it)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.max_body_bytes)
+
 # CORS
 app.add_middleware(
-    CORSMiddleware,
+    OriginSetCORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
@@ -11,6 +11,9 @@ class StrictModel(BaseModel):
     422 validation error instead of being silently ignored and replaced by a
     default. Request/input models should inherit from this; response models
     stay on the permissive ``BaseModel``.
+
+    Instances are frozen: once validated they are only read, never mutated,
+    which also makes cached derived values (e.g. ``Wire.length``) safe.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
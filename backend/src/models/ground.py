@@ -22,7 +22,7 @@ class GroundType(str, Enum):
 
 
 # Ground parameters: (dielectric_constant, conductivity_s_per_m)
-GROUND_PARAMS: dict[str, tuple[float, float]] = {
+GROUND_PARAMS: dict[GroundType, tuple[float, float]] = {
     GroundType.SALT_WATER: (80.0, 5.0),
     GroundType.FRESH_WATER: (80.0, 0.001),
     GroundType.PASTORAL: (14.0, 0.01),
@@ -32,6 +32,14 @@ GROUND_PARAMS: dict[str, tuple[float, float]] = {
     GroundType.DRY_SANDY: (3.0, 0.0001),
 }
 
+# GN card parameters for every non-custom ground type (free space / perfect
+# ground take no dielectric parameters), so lookups need no fallback
+_NEC_GROUND_PARAMS: dict[GroundType, tuple[float, float]] = {
+    GroundType.FREE_SPACE: (0.0, 0.0),
+    GroundType.PERFECT: (0.0, 0.0),
+    **GROUND_PARAMS,
+}
+
 
 class GroundConfig(StrictModel):
     """Ground configuration for NEC2 simulation."""
@@ -55,12 +63,6 @@ class GroundConfig(StrictModel):
 
     def get_nec_params(self) -> tuple[float, float]:
         """Get the (dielectric_constant, conductivity) for NEC2 GN card."""
-        if self.ground_type == GroundType.FREE_SPACE:
-            return (0.0, 0.0)
-        if self.ground_type == GroundType.PERFECT:
-            return (0.0, 0.0)
-        if self.ground_type == GroundType.CUSTOM:
+        if self.ground_type is GroundType.CUSTOM:
             return (self.dielectric_constant, self.conductivity)
-        return GROUND_PARAMS.get(
-            self.ground_type, (self.dielectric_constant, self.conductivity)
-        )
+        return _NEC_GROUND_PARAMS[self.ground_type]
@@ -1,9 +1,16 @@
 """Optimizer configuration and result models."""
 
 from enum import Enum
-from pydantic import BaseModel, Field
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from src.models.limits import MAX_FREQUENCY_MHZ, MIN_FREQUENCY_MHZ
 
+# Wire geometry columns checked up front (same limits as the Wire model)
+_WIRE_GEOMETRY_FIELDS = ("x1", "y1", "z1", "x2", "y2", "z2", "radius")
+_WIRE_GEOMETRY_MIN = np.array([-1000.0] * 6 + [0.0001])
+_WIRE_GEOMETRY_MAX = np.array([1000.0] * 6 + [0.1])
+
 
 class OptimizationObjective(str, Enum):
     """What to optimize for."""
@@ -17,7 +24,9 @@ class OptimizationObjective(str, Enum):
 class OptimizationMethod(str, Enum):
     """Optimization algorithm."""
     NELDER_MEAD = "nelder_mead"
-    # Future: DIFFERENTIAL_EVOLUTION, GENETIC
+    BAYESIAN = "bayesian"            # Gaussian-process surrogate, for expensive runs
+    DIFFERENTIAL_EVOLUTION = "differential_evolution"  # Population evaluated in parallel
+    # Future: GENETIC
 
 
 class OptimizationVariable(BaseModel):
@@ -27,6 +36,8 @@ class OptimizationVariable(BaseModel):
     Variables are specified as: wire_tag, field_name (x1, y1, z1, x2, y2, z2, radius)
     with min/max bounds.
     """
+    model_config = ConfigDict(frozen=True)
+
     wire_tag: int = Field(ge=1, le=9999)
     field: str = Field(description="Wire field to optimize: x1, y1, z1, x2, y2, z2, radius")
     min_value: float = Field(description="Lower bound")
@@ -38,9 +49,17 @@ class OptimizationVariable(BaseModel):
     linked_field: str | None = Field(default=None)
     link_factor: float = Field(default=1.0, description="1.0 = same, -1.0 = mirror")
 
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "OptimizationVariable":
+        if self.max_value < self.min_value:
+            raise ValueError("max_value must be >= min_value")
+        return self
+
 
 class OptimizationWeights(BaseModel):
     """Weights for combined objective."""
+    model_config = ConfigDict(frozen=True)
+
     swr_weight: float = Field(default=1.0, ge=0, le=10)
     gain_weight: float = Field(default=0.0, ge=0, le=10)
     fb_weight: float = Field(default=0.0, ge=0, le=10)
@@ -48,6 +67,8 @@ class OptimizationWeights(BaseModel):
 
 class OptimizationRequest(BaseModel):
     """Request body for POST /api/v1/optimize."""
+    model_config = ConfigDict(frozen=True)
+
     # Base antenna config (same as SimulationRequest)
     wires: list = Field(min_length=1, max_length=500)
     excitations: list = Field(min_length=1)
@@ -67,6 +88,53 @@ class OptimizationRequest(BaseModel):
                                                  description="Target freq for single-freq objectives")
     weights: OptimizationWeights = Field(default_factory=OptimizationWeights)
 
+    @model_validator(mode="after")
+    def validate_wire_tags(self) -> "OptimizationRequest":
+        """Every wire needs an integer tag: the optimizer resolves variables by it."""
+        for i, w in enumerate(self.wires):
+            tag = w.get("tag") if isinstance(w, dict) else None
+            if not isinstance(tag, int) or isinstance(tag, bool):
+                raise ValueError(f"Wire {i + 1}: missing or non-integer tag")
+        return self
+
+    @model_validator(mode="after")
+    def validate_wire_geometry(self) -> "OptimizationRequest":
+        """Reject non-finite, out-of-range or zero-length base wires in one numpy pass.
+
+        Values the optimizer overwrites (variable and linked fields) are not
+        checked. Entries that aren't plain numeric wire dicts are left to the
+        per-iteration Wire validation.
+        """
+        try:
+            geom = np.array(
+                [[w[f] for f in _WIRE_GEOMETRY_FIELDS] for w in self.wires],
+                dtype=np.float64,
+            )
+            # The optimizer only overwrites the first wire with each tag
+            first_wire: dict[int, int] = {}
+            for i, w in enumerate(self.wires):
+                first_wire.setdefault(w["tag"], i)
+        except (TypeError, KeyError, ValueError):
+            return self
+
+        checked = np.ones(geom.shape, dtype=bool)
+        for var in self.variables:
+            for tag, field in ((var.wire_tag, var.field), (var.linked_wire_tag, var.linked_field)):
+                row = first_wire.get(tag) if tag is not None else None
+                if row is not None and field in _WIRE_GEOMETRY_FIELDS:
+                    checked[row, _WIRE_GEOMETRY_FIELDS.index(field)] = False
+
+        if not (np.isfinite(geom) | ~checked).all():
+            raise ValueError("Wire coordinates and radius must be finite")
+        in_range = (geom >= _WIRE_GEOMETRY_MIN) & (geom <= _WIRE_GEOMETRY_MAX)
+        if not (in_range | ~checked).all():
+            raise ValueError("Wire coordinates or radius out of range")
+        fixed = checked[:, :6].all(axis=1)
+        lengths = np.linalg.norm(geom[fixed, 3:6] - geom[fixed, :3], axis=1)
+        if (lengths < 1e-6).any():
+            raise ValueError("Wire endpoints are coincident (zero-length wire)")
+        return self
+
 
 class OptimizationProgress(BaseModel):
     """Progress update during optimization (sent via response or WebSocket)."""
@@ -1,6 +1,8 @@
 """Simulation request/response Pydantic models."""
 
-from pydantic import Field, model_validator
+from functools import cached_property
+
+from pydantic import Field, PrivateAttr, model_validator
 
 from src.models.antenna import Wire, Excitation, LumpedLoad, TransmissionLine, WireArc, GeometryTransform, CylindricalSymmetry
 from src.models.base import StrictModel
@@ -34,7 +36,7 @@ class FrequencyConfig(StrictModel):
             raise ValueError("stop_mhz must be >= start_mhz")
         return self
 
-    @property
+    @cached_property
     def step_mhz(self) -> float:
         if self.steps <= 1:
             return 0.0
@@ -55,7 +57,7 @@ class FrequencySegmentConfig(StrictModel):
             raise ValueError("stop_mhz must be >= start_mhz")
         return self
 
-    @property
+    @cached_property
     def step_mhz(self) -> float:
         if self.steps <= 1:
             return 0.0
@@ -72,11 +74,11 @@ class PatternConfig(StrictModel):
     phi_stop: float = Field(default=355.0, ge=0.0, le=360.0)
     phi_step: float = Field(default=5.0, ge=1.0, le=30.0)
 
-    @property
+    @cached_property
     def n_theta(self) -> int:
         return int((self.theta_stop - self.theta_start) / self.theta_step) + 1
 
-    @property
+    @cached_property
     def n_phi(self) -> int:
         return int((self.phi_stop - self.phi_start) / self.phi_step) + 1
 
@@ -122,6 +124,9 @@ class SimulationRequest(StrictModel):
         default=None, max_length=20,
         description="Multi-band frequency segments (overrides frequency when present)")
 
+    # Memoized by simulation.cache.compute_cache_key (fields are frozen)
+    _cache_key: str | None = PrivateAttr(default=None)
+
     @model_validator(mode="after")
     def validate_frequency_segments_total(self) -> "SimulationRequest":
         """Ensure total frequency points across all segments don't exceed 301."""
@@ -134,26 +139,31 @@ class SimulationRequest(StrictModel):
                 )
         return self
 
+    @cached_property
+    def total_segments(self) -> int:
+        return sum(w.segments for w in self.wires)
+
     @model_validator(mode="after")
-    def validate_total_segments(self) -> "SimulationRequest":
-        total = sum(w.segments for w in self.wires)
+    def validate_wire_references(self) -> "SimulationRequest":
+        # One pass over the wires builds the tag map and the segment total
+        wire_map = {}
+        total = 0
+        for w in self.wires:
+            wire_map[w.tag] = w
+            total += w.segments
+        self.__dict__["total_segments"] = total  # prime the cached_property
         if total > 5000:
             raise ValueError(
                 f"Total segments ({total}) exceeds maximum of 5000"
             )
-        return self
 
-    @model_validator(mode="after")
-    def validate_excitations_reference_valid_wires(self) -> "SimulationRequest":
-        wire_map = {w.tag: w for w in self.wires}
-        wire_tags = set(wire_map.keys())
         for ex in self.excitations:
-            if ex.wire_tag not in wire_tags:
+            wire = wire_map.get(ex.wire_tag)
+            if wire is None:
                 raise ValueError(
                     f"Excitation references wire tag {ex.wire_tag} "
-                    f"which doesn't exist. Valid tags: {wire_tags}"
+                    f"which doesn't exist. Valid tags: {set(wire_map)}"
                 )
-            wire = wire_map[ex.wire_tag]
             if ex.segment < 1 or ex.segment > wire.segments:
                 raise ValueError(
                     f"Excitation on wire {ex.wire_tag} references segment {ex.segment}, "
@@ -161,17 +171,17 @@ class SimulationRequest(StrictModel):
                 )
         # Validate load wire references
         for ld in self.loads:
-            if ld.wire_tag != 0 and ld.wire_tag not in wire_tags:
+            if ld.wire_tag != 0 and ld.wire_tag not in wire_map:
                 raise ValueError(
                     f"Load references wire tag {ld.wire_tag} which doesn't exist"
                 )
         # Validate transmission line wire references
         for tl in self.transmission_lines:
-            if tl.wire_tag1 not in wire_tags:
+            if tl.wire_tag1 not in wire_map:
                 raise ValueError(
                     f"Transmission line references wire tag {tl.wire_tag1} which doesn't exist"
                 )
-            if tl.wire_tag2 not in wire_tags:
+            if tl.wire_tag2 not in wire_map:
                 raise ValueError(
                     f"Transmission line references wire tag {tl.wire_tag2} which doesn't exist"
                 )
@@ -1,70 +1,137 @@
 """Redis-based simulation result caching.
 
-Caches simulation results keyed by a SHA-256 hash of the canonical
-request JSON. Results are zlib-compressed to reduce memory usage.
+Caches simulation results keyed by a SHA-256 hash of the serialized
+request JSON. Results are zstd-compressed (zlib if the optional
+`zstandard` package is missing) to reduce memory usage.
 TTL: 1 hour.
 """
 
+import asyncio
 import hashlib
-import json
 import logging
+import threading
 import zlib
-from typing import Any
 
 import redis.asyncio as redis
 
+try:
+    import zstandard
+except ImportError:  # Optional: fall back to zlib
+    zstandard = None  # type: ignore[assignment]
+
 from src.config import settings
+from src.models.simulation import SimulationRequest
 
 logger = logging.getLogger("antsim.cache")
 
 _redis_pool: redis.Redis | None = None
+_connection_pool: redis.BlockingConnectionPool | None = None
+# Cache writes in flight; kept referenced until done and drained by close_redis
+_pending_writes: set[asyncio.Task[None]] = set()
 CACHE_TTL_SECONDS = 3600  # 1 hour
+REDIS_WARM_CONNECTIONS = 8  # Connections opened up front so bursts skip the handshake
+
+# Frames are told apart by their magic bytes, so entries written by either
+# codec stay readable (e.g. across a deploy that adds or drops zstandard)
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Level 6 stores results ~25% smaller than level 3 for well under a millisecond
+# more on the (once per result) write; decompression speed doesn't depend on it
+ZSTD_LEVEL = 6
+# Results at least this large are compressed in a worker thread (both codecs
+# release the GIL) so a multi-MB pattern doesn't stall the event loop
+COMPRESS_OFFLOAD_BYTES = 64 * 1024
+if zstandard is not None:
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+# ZstdCompressor isn't safe for concurrent use: one per thread
+_zstd_local = threading.local()
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        compressor = getattr(_zstd_local, "compressor", None)
+        if compressor is None:
+            compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return compressor.compress(data)
+    return zlib.compress(data, level=6)
+
+
+def _decompress(data: bytes) -> bytes:
+    if data.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed entry but zstandard is not installed")
+        return _zstd_decompressor.decompress(data)
+    return zlib.decompress(data)
 
 
 async def get_redis() -> redis.Redis | None:
-    """Get or create the Redis connection pool. Returns None if unavailable."""
-    global _redis_pool
+    """Get or create the shared Redis client. Returns None if unavailable.
+
+    Every caller (cache, rate limiter, health) shares one bounded
+    BlockingConnectionPool: bursts wait briefly for a free connection
+    instead of opening new ones without limit.
+    """
+    global _redis_pool, _connection_pool
     if _redis_pool is not None:
         return _redis_pool
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        timeout=2,
+        socket_connect_timeout=2,
+        socket_timeout=2,
+    )
+    client = redis.Redis(connection_pool=pool)
     try:
-        _redis_pool = redis.from_url(
-            settings.redis_url,
-            decode_responses=False,
-            socket_connect_timeout=2,
-            socket_timeout=2,
-        )
-        # Verify connection
-        await _redis_pool.ping()
-        logger.info("Redis connected at %s", settings.redis_url)
-        return _redis_pool
+        # Verify connection, then pre-open a few more for the first burst
+        await client.ping()
+        warm = min(REDIS_WARM_CONNECTIONS, settings.redis_max_connections)
+        await asyncio.gather(*(client.ping() for _ in range(warm)))
     except Exception as e:
         logger.warning("Redis unavailable: %s — caching disabled", e)
-        _redis_pool = None
+        await pool.disconnect()
         return None
+    logger.info("Redis connected at %s", settings.redis_url)
+    _redis_pool, _connection_pool = client, pool
+    return client
+
+
+def current_redis() -> redis.Redis | None:
+    """The shared Redis client if one is connected, without trying to connect."""
+    return _redis_pool
 
 
 async def close_redis() -> None:
-    """Close the Redis connection pool."""
-    global _redis_pool
+    """Flush pending cache writes, then close the shared Redis client and pool."""
+    global _redis_pool, _connection_pool
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
     if _redis_pool is not None:
-        await _redis_pool.close()
+        await _redis_pool.aclose()
         _redis_pool = None
+    if _connection_pool is not None:
+        await _connection_pool.disconnect()
+        _connection_pool = None
         logger.info("Redis connection closed")
 
 
-def compute_cache_key(request_dict: dict[str, Any]) -> str:
-    """Compute a deterministic cache key from the simulation request.
+def compute_cache_key(request: SimulationRequest) -> str:
+    """Compute a deterministic cache key for a simulation request.
 
-    Canonicalizes the JSON (sorted keys, no whitespace) and returns
-    a SHA-256 hex digest prefixed with 'sim:'.
+    Hashes the `model_dump_json()` bytes, whose field order is fixed by the
+    model declaration, in one shot with SHA-256 (hardware-accelerated by
+    OpenSSL where the CPU has SHA extensions) and returns the first 128 bits
+    as hex, prefixed with 'sim:'. The key is memoized on the (frozen)
+    request, so later callers don't re-dump and re-hash it.
     """
-    canonical = json.dumps(request_dict, sort_keys=True, separators=(",", ":"))
-    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
-    return f"sim:{digest}"
+    key = request._cache_key
+    if key is None:
+        digest = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+        key = request._cache_key = f"sim:{digest[:32]}"
+    return key
 
 
-async def get_cached_result(cache_key: str) -> dict[str, Any] | None:
-    """Retrieve a cached simulation result. Returns None on miss or error."""
+async def get_cached_result(cache_key: str) -> bytes | None:
+    """Retrieve a cached simulation result as JSON bytes. Returns None on miss or error."""
     r = await get_redis()
     if r is None:
         return None
@@ -72,8 +139,7 @@ async def get_cached_result(cache_key: str) -> dict[str, Any] | None:
         data = await r.get(cache_key)
         if data is None:
             return None
-        decompressed = zlib.decompress(data)
-        result = json.loads(decompressed)
+        result = _decompress(data)
         logger.debug("Cache HIT: %s", cache_key)
         return result
     except Exception as e:
@@ -81,15 +147,29 @@ async def get_cached_result(cache_key: str) -> dict[str, Any] | None:
         return None
 
 
-async def set_cached_result(cache_key: str, result_dict: dict[str, Any]) -> None:
-    """Store a simulation result in cache with TTL."""
+def set_cached_result(cache_key: str, result_json: bytes | str) -> None:
+    """Store an already-serialized simulation result in cache with TTL.
+
+    Fire-and-forget: the compress + SET runs as a background task so the
+    response never waits on Redis. Failures are logged, never raised.
+    """
+    task = asyncio.create_task(_write_cached_result(cache_key, result_json))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def _write_cached_result(cache_key: str, result_json: bytes | str) -> None:
     r = await get_redis()
     if r is None:
         return
     try:
-        serialized = json.dumps(result_dict, separators=(",", ":"))
-        compressed = zlib.compress(serialized.encode("utf-8"), level=6)
-        await r.setex(cache_key, CACHE_TTL_SECONDS, compressed)
+        if isinstance(result_json, str):
+            result_json = result_json.encode("utf-8")
+        if len(result_json) >= COMPRESS_OFFLOAD_BYTES:
+            compressed = await asyncio.to_thread(_compress, result_json)
+        else:
+            compressed = _compress(result_json)
+        await r.set(cache_key, compressed, ex=CACHE_TTL_SECONDS)
         logger.debug(
             "Cache SET: %s (%d bytes compressed)", cache_key, len(compressed)
         )
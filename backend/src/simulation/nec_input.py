@@ -1,116 +1,246 @@
 """Build NEC2 card deck from simulation request models."""
 
-from src.models.simulation import SimulationRequest
-from src.models.ground import GroundType
+import io
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
+from operator import attrgetter
+from typing import TextIO
 
+from src.models.antenna import (
+    CylindricalSymmetry,
+    Excitation,
+    GeometryTransform,
+    LumpedLoad,
+    TransmissionLine,
+    Wire,
+    WireArc,
+)
+from src.models.simulation import NearFieldConfig, PatternConfig, SimulationRequest
+from src.models.ground import GroundConfig, GroundType
 
-def build_card_deck(request: SimulationRequest) -> str:
+# Pattern used when a deck is built without an explicit pattern (file export)
+_DEFAULT_PATTERN = PatternConfig()
+
+# Recently built decks by request cache key (see cache.compute_cache_key).
+# Decks top out around 40 KB, so this stays within a few MB per worker.
+_deck_cache: OrderedDict[str, str] = OrderedDict()
+_DECK_CACHE_MAX = 64
+
+# ---- Card templates ----
+# Repeated per-element cards (GW/GA, LD/TL): %-format the attrgetter tuple
+# directly and write each batch with a single join
+_GW = "GW %d %d %.6f %.6f %.6f %.6f %.6f %.6f %.6f\n"
+_GW_FIELDS = attrgetter("tag", "segments", "x1", "y1", "z1", "x2", "y2", "z2", "radius")
+_GA = "GA %d %d %.6f %.2f %.2f %.6f\n"
+_GA_FIELDS = attrgetter("tag", "segments", "arc_radius", "start_angle", "end_angle", "wire_radius")
+_LD = "LD %d %d %d %d %.6g %.6g %.6g\n"
+_LD_FIELDS = attrgetter(
+    "load_type.value", "wire_tag", "segment_start", "segment_end", "param1", "param2", "param3",
+)
+_TL = "TL %d %d %d %d %.4f %.6f %.6g %.6g %.6g %.6g\n"
+_TL_FIELDS = attrgetter(
+    "wire_tag1", "segment1", "wire_tag2", "segment2", "impedance", "length",
+    "shunt_admittance_real1", "shunt_admittance_imag1",
+    "shunt_admittance_real2", "shunt_admittance_imag2",
+)
+
+# Bound str.format methods, so each card's format spec is parsed only once
+_GM = "GM {} {} {:.4f} {:.4f} {:.4f} {:.6f} {:.6f} {:.6f} {}\n".format
+_GR = "GR {} {}\n".format
+_GN_REAL = "GN 2 0 0 0 {:.4f} {:.6f}\n".format
+_EX = "EX 0 {} {} 0 {:.4f} {:.4f}\n".format
+_FR = "FR 0 {} 0 0 {:.6f} {:.6f}\n".format
+_NE = "NE 0 {} {} {} {:.4f} {:.4f} {:.4f} {:.4f} {:.4f} {:.4f}\n".format
+_RP = "RP 0 {} {} 1000 {:.1f} {:.1f} {:.1f} {:.1f}\n".format
+
+
+def build_card_deck(request: SimulationRequest, wire_cards: str | None = None) -> str:
     """Generate a complete NEC2 input card deck from a SimulationRequest.
 
     Supports V1 cards: CM, CE, GW, GE, GN, EX, FR, RP, EN
     Supports V2 cards: LD (loads), TL (transmission lines), PT (current output)
 
+    wire_cards, if given, is the request's GW cards already formatted (one
+    build_wire_card per wire, in order), e.g. by a caller that reuses the
+    cards of wires it knows didn't change.
+
     Returns the full .nec file content as a string.
     """
-    lines: list[str] = []
+    if request.frequency_segments:
+        sorted_segments = sorted(request.frequency_segments, key=lambda s: s.start_mhz)
+        sweeps = tuple((seg.start_mhz, seg.stop_mhz, seg.steps) for seg in sorted_segments)
+    else:
+        freq = request.frequency
+        sweeps = ((freq.start_mhz, freq.stop_mhz, freq.steps),)
+
+    buf = io.StringIO()
+    buf.write(f"CM {request.comment}\nCE\n")
+    _write_geometry_cards(
+        buf,
+        request.wires,
+        request.excitations,
+        request.loads,
+        request.transmission_lines,
+        request.ground,
+        arcs=request.arcs,
+        transforms=request.transforms,
+        symmetry=request.symmetry,
+        compute_currents=request.compute_currents,
+        wire_cards=wire_cards,
+    )
+    buf.write(_frequency_cards(sweeps, request.pattern, request.near_field))
+    buf.write("EN\n")
+
+    return buf.getvalue()
+
+
+def build_card_deck_for_key(request: SimulationRequest, cache_key: str) -> str:
+    """build_card_deck, memoized per worker on the request's result-cache key.
+
+    Lets retries of a request whose result never reached Redis (simulation
+    failure, Redis down) skip regenerating an identical deck.
+    """
+    deck = _deck_cache.get(cache_key)
+    if deck is not None:
+        _deck_cache.move_to_end(cache_key)
+        return deck
+    deck = build_card_deck(request)
+    _deck_cache[cache_key] = deck
+    if len(_deck_cache) > _DECK_CACHE_MAX:
+        _deck_cache.popitem(last=False)
+    return deck
+
+
+def build_wire_card(wire: Wire) -> str:
+    """The GW card for one wire, as build_card_deck writes it."""
+    return _GW % _GW_FIELDS(wire)
+
+
+def build_export_card_deck(
+    comment: str,
+    wires: Sequence[Wire],
+    excitations: Sequence[Excitation],
+    loads: Sequence[LumpedLoad],
+    transmission_lines: Sequence[TransmissionLine],
+    ground: GroundConfig,
+    start_mhz: float,
+    stop_mhz: float,
+    steps: int,
+) -> str:
+    """Generate a .nec file from already-validated parts, with the default pattern.
+
+    Produces the same deck as build_card_deck for an equivalent request,
+    without re-validating everything through a SimulationRequest.
+    """
+    buf = io.StringIO()
+    buf.write(f"CM {comment}\nCE\n")
+    _write_geometry_cards(buf, wires, excitations, loads, transmission_lines, ground)
+    buf.write(_frequency_cards(((start_mhz, stop_mhz, steps),), _DEFAULT_PATTERN))
+    buf.write("EN\n")
 
-    # Comment cards
-    lines.append(f"CM {request.comment}")
-    lines.append("CE")
+    return buf.getvalue()
+
+
+def _write_geometry_cards(
+    buf: TextIO,
+    wires: Sequence[Wire],
+    excitations: Sequence[Excitation],
+    loads: Sequence[LumpedLoad],
+    transmission_lines: Sequence[TransmissionLine],
+    ground: GroundConfig,
+    *,
+    arcs: Sequence[WireArc] = (),
+    transforms: Sequence[GeometryTransform] = (),
+    symmetry: CylindricalSymmetry | None = None,
+    compute_currents: bool = False,
+    wire_cards: str | None = None,
+) -> None:
+    """Write the geometry and program control cards (GW ... EX) to buf."""
+    write = buf.write
 
     # ---- Geometry Section ----
 
     # GW cards for each wire
-    for wire in request.wires:
-        lines.append(
-            f"GW {wire.tag} {wire.segments} "
-            f"{wire.x1:.6f} {wire.y1:.6f} {wire.z1:.6f} "
-            f"{wire.x2:.6f} {wire.y2:.6f} {wire.z2:.6f} "
-            f"{wire.radius:.6f}"
-        )
+    if wire_cards is None:
+        wire_cards = "".join([_GW % _GW_FIELDS(wire) for wire in wires])
+    write(wire_cards)
 
     # GA cards for wire arcs
-    for arc in request.arcs:
-        lines.append(
-            f"GA {arc.tag} {arc.segments} "
-            f"{arc.arc_radius:.6f} {arc.start_angle:.2f} {arc.end_angle:.2f} "
-            f"{arc.wire_radius:.6f}"
-        )
+    if arcs:
+        write("".join([_GA % _GA_FIELDS(arc) for arc in arcs]))
 
     # GM cards for geometry transforms
-    for gm in request.transforms:
-        lines.append(
-            f"GM {gm.tag_increment} {gm.n_new_structures} "
-            f"{gm.rot_x:.4f} {gm.rot_y:.4f} {gm.rot_z:.4f} "
-            f"{gm.trans_x:.6f} {gm.trans_y:.6f} {gm.trans_z:.6f} "
-            f"{gm.start_tag}"
-        )
+    for gm in transforms:
+        write(_GM(
+            gm.tag_increment, gm.n_new_structures,
+            gm.rot_x, gm.rot_y, gm.rot_z,
+            gm.trans_x, gm.trans_y, gm.trans_z,
+            gm.start_tag,
+        ))
 
     # GR card for cylindrical symmetry
-    if request.symmetry:
-        lines.append(
-            f"GR {request.symmetry.tag_increment} {request.symmetry.n_copies}"
-        )
+    if symmetry:
+        write(_GR(symmetry.tag_increment, symmetry.n_copies))
 
-    # Geometry end
-    # GE 1 if ground-connected vertical (wire touches z=0), GE 0 otherwise
-    ground_type = request.ground.ground_type
-    if ground_type == GroundType.FREE_SPACE:
-        lines.append("GE -1")
-    else:
-        lines.append("GE 0")
+    # Geometry end + ground card
+    write(_ground_cards(ground))
 
     # ---- Program Control Section ----
 
-    # Ground card
-    if ground_type == GroundType.FREE_SPACE:
-        lines.append("GN -1")
-    elif ground_type == GroundType.PERFECT:
-        lines.append("GN 1 0 0 0 0 0")
-    else:
-        eps_r, sigma = request.ground.get_nec_params()
-        lines.append(f"GN 2 0 0 0 {eps_r:.4f} {sigma:.6f}")
-
     # V2: Loading cards (LD)
-    for ld in request.loads:
-        # LD TYPE TAG SEG_START SEG_END PARAM1 PARAM2 PARAM3
-        lines.append(
-            f"LD {ld.load_type.value} {ld.wire_tag} {ld.segment_start} {ld.segment_end} "
-            f"{ld.param1:.6g} {ld.param2:.6g} {ld.param3:.6g}"
-        )
+    # LD TYPE TAG SEG_START SEG_END PARAM1 PARAM2 PARAM3
+    if loads:
+        write("".join([_LD % _LD_FIELDS(ld) for ld in loads]))
 
     # V2: Transmission line cards (TL)
-    for tl in request.transmission_lines:
-        # TL TAG1 SEG1 TAG2 SEG2 Z0 LENGTH SHUNT_Y1_R SHUNT_Y1_I SHUNT_Y2_R SHUNT_Y2_I
-        lines.append(
-            f"TL {tl.wire_tag1} {tl.segment1} {tl.wire_tag2} {tl.segment2} "
-            f"{tl.impedance:.4f} {tl.length:.6f} "
-            f"{tl.shunt_admittance_real1:.6g} {tl.shunt_admittance_imag1:.6g} "
-            f"{tl.shunt_admittance_real2:.6g} {tl.shunt_admittance_imag2:.6g}"
-        )
+    # TL TAG1 SEG1 TAG2 SEG2 Z0 LENGTH SHUNT_Y1_R SHUNT_Y1_I SHUNT_Y2_R SHUNT_Y2_I
+    if transmission_lines:
+        write("".join([_TL % _TL_FIELDS(tl) for tl in transmission_lines]))
 
     # V2: Current output control
-    if request.compute_currents:
-        lines.append("PT 0 0 0 0")  # Print currents normally
+    if compute_currents:
+        write("PT 0 0 0 0\n")  # Print currents normally
     else:
-        lines.append("PT -1 0 0 0")  # Suppress current printout
+        write("PT -1 0 0 0\n")  # Suppress current printout
 
     # Excitation cards
-    for ex in request.excitations:
-        lines.append(
-            f"EX 0 {ex.wire_tag} {ex.segment} 0 "
-            f"{ex.voltage_real:.4f} {ex.voltage_imag:.4f}"
-        )
+    for ex in excitations:
+        write(_EX(ex.wire_tag, ex.segment, ex.voltage_real, ex.voltage_imag))
+
+
+# The fragments below depend only on small frozen (hashable) configs that
+# repeat across requests, e.g. every optimizer evaluation, so they're memoized.
+
+@lru_cache(maxsize=128)
+def _ground_cards(ground: GroundConfig) -> str:
+    """GE (geometry end) and GN (ground) cards for a ground configuration."""
+    # GE 1 if ground-connected vertical (wire touches z=0), GE 0 otherwise
+    ground_type = ground.ground_type
+    if ground_type == GroundType.FREE_SPACE:
+        return "GE -1\nGN -1\n"
+    if ground_type == GroundType.PERFECT:
+        return "GE 0\nGN 1 0 0 0 0 0\n"
+    eps_r, sigma = ground.get_nec_params()
+    return "GE 0\n" + _GN_REAL(eps_r, sigma)
+
 
-    # ---- Frequency sweep + execution cards ----
-    # NEC2 processes cards sequentially: each FR card sets the active frequencies,
-    # and the following NE/RP cards trigger computation at those frequencies.
-    # For multi-segment sweeps, we emit FR + NE + RP for each segment.
+@lru_cache(maxsize=128)
+def _frequency_cards(
+    sweeps: tuple[tuple[float, float, int], ...],
+    pattern: PatternConfig,
+    near_field: NearFieldConfig | None = None,
+) -> str:
+    """Frequency sweep + execution cards for (start, stop, steps) ranges.
 
+    NEC2 processes cards sequentially: each FR card sets the active frequencies,
+    and the following NE/RP cards trigger computation at those frequencies.
+    For multi-segment sweeps, we emit FR + NE + RP for each segment.
+    """
     # Build NE card string (if near-field requested)
-    ne_card: str | None = None
-    if request.near_field and request.near_field.enabled:
-        nf = request.near_field
+    ne_card = ""
+    if near_field and near_field.enabled:
+        nf = near_field
         if nf.plane == "horizontal":
             nx = int(2 * nf.extent_m / nf.resolution_m) + 1
             ny = nx
@@ -123,33 +253,21 @@ def build_card_deck(request: SimulationRequest) -> str:
             nz = int(nf.extent_m / nf.resolution_m) + 1
             x0, y0, z0 = -nf.extent_m, 0.0, 0.0
             dx, dy, dz = nf.resolution_m, 0.0, nf.resolution_m
-        ne_card = f"NE 0 {nx} {ny} {nz} {x0:.4f} {y0:.4f} {z0:.4f} {dx:.4f} {dy:.4f} {dz:.4f}"
+        ne_card = _NE(nx, ny, nz, x0, y0, z0, dx, dy, dz)
 
     # Build RP card string
-    pat = request.pattern
-    rp_card = (
-        f"RP 0 {pat.n_theta} {pat.n_phi} 1000 "
-        f"{pat.theta_start:.1f} {pat.phi_start:.1f} "
-        f"{pat.theta_step:.1f} {pat.phi_step:.1f}"
+    rp_card = _RP(
+        pattern.n_theta, pattern.n_phi,
+        pattern.theta_start, pattern.phi_start,
+        pattern.theta_step, pattern.phi_step,
     )
 
-    def emit_frequency_block(start_mhz: float, stop_mhz: float, steps: int) -> None:
-        """Emit FR + NE + RP cards for one frequency range."""
+    # NE/RP follow every FR card
+    exec_cards = ne_card + rp_card
+    parts: list[str] = []
+    for start_mhz, stop_mhz, steps in sweeps:
+        # Emit FR + NE + RP cards for one frequency range
         step_mhz = (stop_mhz - start_mhz) / (steps - 1) if steps > 1 else 0.0
-        lines.append(f"FR 0 {steps} 0 0 {start_mhz:.6f} {step_mhz:.6f}")
-        if ne_card:
-            lines.append(ne_card)
-        lines.append(rp_card)
-
-    if request.frequency_segments:
-        sorted_segments = sorted(request.frequency_segments, key=lambda s: s.start_mhz)
-        for seg in sorted_segments:
-            emit_frequency_block(seg.start_mhz, seg.stop_mhz, seg.steps)
-    else:
-        freq = request.frequency
-        emit_frequency_block(freq.start_mhz, freq.stop_mhz, freq.steps)
-
-    # End card
-    lines.append("EN")
-
-    return "\n".join(lines) + "\n"
+        parts.append(_FR(steps, start_mhz, step_mhz))
+        parts.append(exec_cards)
+    return "".join(parts)
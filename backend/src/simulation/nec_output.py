@@ -3,89 +3,108 @@
 import math
 import re
 import logging
+from bisect import bisect_left
+from itertools import islice
+
+from typing import Any
+
+import numpy as np
+from pydantic import TypeAdapter
 
 from src.models.results import (
     Impedance,
     PatternData,
     FrequencyResult,
-    SegmentCurrent,
     NearFieldResult,
+    SegmentCurrent,
 )
 
 logger = logging.getLogger("antsim.nec_output")
 
-# Floating point in scientific notation: matches 1.4000E+01, -3.7469E+01, etc.
-_SCI = r"[+-]?\d+\.\d+E[+-]\d+"
-_NUM = r"[+-]?\d+\.?\d*(?:E[+-]?\d+)?"
+# Validates a frequency's current rows in one pydantic-core call
+_SEGMENT_CURRENTS_ADAPTER = TypeAdapter(list[SegmentCurrent])
 
-# Frequency header: "FREQUENCY : 1.4000E+01 MHz"
-_FREQUENCY_RE = re.compile(r"FREQUENCY\s*:\s*(" + _SCI + r")\s*MHZ", re.IGNORECASE)
-
-# Antenna input parameters section header
-_INPUT_PARAMS_RE = re.compile(r"ANTENNA INPUT PARAMETERS")
+# Floating point in scientific notation: matches 1.4000E+01, -3.7469E+01, etc.
+_SCI = rb"[+-]?\d+\.\d+E[+-]\d+"
+_NUM = rb"[+-]?\d+\.?\d*(?:E[+-]?\d+)?"
+
+# Every header/marker parse_nec_output reacts to, as one alternation whose
+# matching branch is read from `lastgroup`. Only the frequency and power
+# markers are case-insensitive. The lookahead on the possible first letters
+# lets the regex engine skip straight to candidate positions.
+_MARKER_RE = re.compile(
+    rb"(?=[FfACRrIi])(?:"
+    # Frequency header: "FREQUENCY : 1.4000E+01 MHz"
+    rb"(?P<freq>(?i:FREQUENCY\s*:\s*(?P<freq_mhz>" + _SCI + rb")\s*MHZ))"
+    # Section headers
+    rb"|(?P<input_params>ANTENNA INPUT PARAMETERS)"
+    rb"|(?P<currents>CURRENTS AND LOCATION)"
+    rb"|(?P<pattern>RADIATION PATTERNS)"
+    # Power budget: "RADIATED POWER=" and "INPUT POWER =" lines
+    rb"|(?P<power_radiated>(?i:RADIATED\s+POWER\s*=\s*(?P<radiated_w>" + _NUM + rb")\s*WATTS))"
+    rb"|(?P<power_input>(?i:INPUT\s+POWER\s*=\s*(?P<input_w>" + _NUM + rb")\s*WATTS))"
+    rb")"
+)
+# A literal every _MARKER_RE match contains (upper-cased), for locating the
+# few candidate lines with bytes.find instead of searching every line
+_MARKER_KEYWORDS = (
+    b"FREQUENCY",
+    b"ANTENNA INPUT PARAMETERS",
+    b"CURRENTS AND LOCATION",
+    b"RADIATION PATTERNS",
+    b"POWER",
+)
+# Without currents requested, a currents header changes nothing in
+# parse_nec_output, so its keyword needn't be scanned for
+_MARKER_KEYWORDS_NO_CURRENTS = tuple(k for k in _MARKER_KEYWORDS if k != b"CURRENTS AND LOCATION")
 
 # Impedance data line (scientific notation):
 # TAG  SEG  V_REAL  V_IMAG  I_REAL  I_IMAG  Z_REAL  Z_IMAG  Y_REAL  Y_IMAG  POWER
 _IMPEDANCE_RE = re.compile(
-    r"\s*(\d+)\s+(\d+)\s+"               # tag, segment
-    r"(" + _SCI + r")\s+(" + _SCI + r")\s+"  # voltage real, imag
-    r"(" + _SCI + r")\s+(" + _SCI + r")\s+"  # current real, imag
-    r"(" + _SCI + r")\s+(" + _SCI + r")\s+"  # impedance real, imag
-    r"(" + _SCI + r")\s+(" + _SCI + r")\s+"  # admittance real, imag
-    r"(" + _SCI + r")"                        # power
+    rb"\s*(\d+)\s+(\d+)\s+"               # tag, segment
+    rb"(" + _SCI + rb")\s+(" + _SCI + rb")\s+"  # voltage real, imag
+    rb"(" + _SCI + rb")\s+(" + _SCI + rb")\s+"  # current real, imag
+    rb"(" + _SCI + rb")\s+(" + _SCI + rb")\s+"  # impedance real, imag
+    rb"(" + _SCI + rb")\s+(" + _SCI + rb")\s+"  # admittance real, imag
+    rb"(" + _SCI + rb")"                        # power
 )
 
-# Radiation pattern section header
-_PATTERN_HEADER_RE = re.compile(r"RADIATION PATTERNS")
-
 # Pattern data line:
 # THETA  PHI  VERTC_DB  HORIZ_DB  TOTAL_DB  AXIAL_RATIO  TILT  SENSE  MAG  PHASE  MAG  PHASE
 _PATTERN_LINE_RE = re.compile(
-    r"\s*(" + _NUM + r")\s+(" + _NUM + r")\s+"    # theta, phi
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+"        # vert_db, horiz_db
-    r"(" + _NUM + r")\s+"                           # total_db
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+"        # axial_ratio, tilt
-    r"(\w+)"                                        # sense (LINEAR, etc.)
-)
-
-# Power budget parsing:
-# "POWER RADIATED"  and "POWER INPUT" lines from NEC2 output
-_POWER_RADIATED_RE = re.compile(
-    r"RADIATED\s+POWER\s*=\s*(" + _NUM + r")\s*WATTS", re.IGNORECASE
+    rb"\s*(" + _NUM + rb")\s+(" + _NUM + rb")\s+"    # theta, phi
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+"        # vert_db, horiz_db
+    rb"(" + _NUM + rb")\s+"                           # total_db
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+"        # axial_ratio, tilt
+    rb"(\w+)"                                        # sense (LINEAR, etc.)
 )
-_POWER_INPUT_RE = re.compile(
-    r"INPUT\s+POWER\s*=\s*(" + _NUM + r")\s*WATTS", re.IGNORECASE
-)
-
-# Current distribution section header
-_CURRENT_HEADER_RE = re.compile(r"CURRENTS AND LOCATION")
 
 # Current data line:
 # SEG  TAG  X  Y  Z  LENGTH  REAL  IMAG  MAG  PHASE
 _CURRENT_LINE_RE = re.compile(
-    r"\s*(\d+)\s+(\d+)\s+"                            # seg, tag
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+(" + _NUM + r")\s+"  # x, y, z
-    r"(" + _NUM + r")\s+"                               # length
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+"             # real, imag
-    r"(" + _NUM + r")\s+(" + _NUM + r")"                # magnitude, phase
+    rb"\s*(\d+)\s+(\d+)\s+"                            # seg, tag
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+(" + _NUM + rb")\s+"  # x, y, z
+    rb"(" + _NUM + rb")\s+"                               # length
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+"             # real, imag
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")"                # magnitude, phase
 )
 
 
-# Near electric field section header
-_NEAR_FIELD_HEADER_RE = re.compile(r"NEAR ELECTRIC FIELDS")
+# Near electric field section header (plain substring test)
+_NEAR_FIELD_HEADER = b"NEAR ELECTRIC FIELDS"
 
 # Near field data line:
 # X  Y  Z  EX_MAG  EX_PHASE  EY_MAG  EY_PHASE  EZ_MAG  EZ_PHASE
 _NEAR_FIELD_LINE_RE = re.compile(
-    r"\s*(" + _NUM + r")\s+(" + _NUM + r")\s+(" + _NUM + r")\s+"  # x, y, z
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+"  # ex_mag, ex_phase
-    r"(" + _NUM + r")\s+(" + _NUM + r")\s+"  # ey_mag, ey_phase
-    r"(" + _NUM + r")\s+(" + _NUM + r")"     # ez_mag, ez_phase
+    rb"\s*(" + _NUM + rb")\s+(" + _NUM + rb")\s+(" + _NUM + rb")\s+"  # x, y, z
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+"  # ex_mag, ex_phase
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")\s+"  # ey_mag, ey_phase
+    rb"(" + _NUM + rb")\s+(" + _NUM + rb")"     # ez_mag, ez_phase
 )
 
 
 def parse_near_field_output(
-    output: str,
+    output: bytes,
     plane: str = "horizontal",
     height_m: float = 0.0,
     extent_m: float = 20.0,
@@ -101,7 +120,7 @@ def parse_near_field_output(
     raw_data: list[tuple[float, float, float, float]] = []  # x, y, z, |E|
 
     for line in lines:
-        if _NEAR_FIELD_HEADER_RE.search(line):
+        if _NEAR_FIELD_HEADER in line:
             in_near_field = True
             skip_lines = 3  # Skip column headers
             continue
@@ -111,7 +130,7 @@ def parse_near_field_output(
                 skip_lines -= 1
                 continue
 
-            m = _NEAR_FIELD_LINE_RE.search(line)
+            m = _NEAR_FIELD_LINE_RE.match(line)
             if m:
                 x = float(m.group(1))
                 y = float(m.group(2))
@@ -119,11 +138,11 @@ def parse_near_field_output(
                 ex_mag = float(m.group(4))
                 ey_mag = float(m.group(6))
                 ez_mag = float(m.group(8))
-                e_total = math.sqrt(ex_mag ** 2 + ey_mag ** 2 + ez_mag ** 2)
+                e_total = math.hypot(ex_mag, ey_mag, ez_mag)
                 raw_data.append((x, y, z, e_total))
                 continue
 
-            if line.strip() == "":
+            if not line or line.isspace():
                 if raw_data:
                     in_near_field = False
 
@@ -180,7 +199,7 @@ def parse_near_field_output(
 
 
 def _compute_beamwidth(
-    pattern_data: list[tuple[float, float, float]],
+    pattern_data: list[list[float]],
     gain_max_dbi: float,
     gain_max_theta: float,
     gain_max_phi: float,
@@ -225,6 +244,36 @@ def _compute_beamwidth(
     return beamwidth_e, beamwidth_h
 
 
+def _compute_beamwidth_grid(
+    thetas: np.ndarray,
+    phis: np.ndarray,
+    gains: np.ndarray,
+    gain_max_dbi: float,
+    gain_max_theta: float,
+    gain_max_phi: float,
+    theta_step: float,
+    phi_step: float,
+) -> tuple[float | None, float | None]:
+    """_compute_beamwidth over parsed pattern columns with no duplicate cells."""
+    threshold = gain_max_dbi - 3.0
+    thetas = np.round(thetas, 2)
+    phis = np.round(phis, 2)
+
+    e_rows = np.flatnonzero(np.abs(phis - gain_max_phi) < phi_step * 0.6)
+    e_rows = e_rows[np.argsort(thetas[e_rows], kind="stable")]
+    beamwidth_e = _find_beamwidth_from_cut(
+        list(zip(thetas[e_rows].tolist(), gains[e_rows].tolist())), threshold,
+    )
+
+    h_rows = np.flatnonzero(np.abs(thetas - gain_max_theta) < theta_step * 0.6)
+    h_rows = h_rows[np.argsort(phis[h_rows], kind="stable")]
+    beamwidth_h = _find_beamwidth_from_cut(
+        list(zip(phis[h_rows].tolist(), gains[h_rows].tolist())), threshold,
+    )
+
+    return beamwidth_e, beamwidth_h
+
+
 def _find_beamwidth_from_cut(
     sorted_gains: list[tuple[float, float]],
     threshold: float,
@@ -292,7 +341,7 @@ def compute_swr(z_real: float, z_imag: float, z0: float = 50.0) -> float:
 
     gamma_real = (num_real * den_real + num_imag * den_imag) / den_mag_sq
     gamma_imag = (num_imag * den_real - num_real * den_imag) / den_mag_sq
-    gamma_mag = math.sqrt(gamma_real * gamma_real + gamma_imag * gamma_imag)
+    gamma_mag = math.hypot(gamma_real, gamma_imag)
 
     if gamma_mag >= 1.0:
         return 999.0
@@ -301,8 +350,135 @@ def compute_swr(z_real: float, z_imag: float, z0: float = 50.0) -> float:
     return round(swr, 4)
 
 
+# ---- Data rows ----
+# Inside their sections, pattern and current rows are fixed whitespace-separated
+# columns, so bytes.split + float() (one C pass each) parses them without the
+# regex engine. Anything that doesn't split cleanly (abutted negative numbers,
+# stray text, non-finite values) falls back to the row regex, which remains
+# the reference for what counts as a row. Row regexes are applied with
+# .match(): a row starts with its first column, so text lines fail at their
+# first character instead of being retried from every offset.
+
+_CurrentRow = tuple[int, int, float, float, float, float, float, float, float]
+
+# Bytes a row's first column can start with (see _NUM)
+_NUMBER_START = b"+-0123456789"
+
+
+def _split_pattern_row(line: bytes) -> tuple[float, float, float] | None:
+    """(theta, phi, total_db) from a radiation pattern row, or None."""
+    parts = line.split()
+    if len(parts) >= 8 and (parts[7][:1].isalnum() or parts[7][:1] == b"_"):
+        try:
+            theta, phi, _vert, _horiz, total_db, _axial, _tilt = map(float, parts[:7])
+        except ValueError:
+            pass
+        else:
+            if math.isfinite(theta + phi + total_db):
+                return theta, phi, total_db
+    if not parts or parts[0][0] not in _NUMBER_START:
+        return None  # blank or text line: the regex would fail on it too
+    m = _PATTERN_LINE_RE.match(line)
+    if m is None:
+        return None
+    return float(m.group(1)), float(m.group(2)), float(m.group(5))
+
+
+def _split_current_row(line: bytes) -> _CurrentRow | None:
+    """(seg, tag, x, y, z, real, imag, mag, phase) from a current row, or None.
+
+    Coordinates are in wavelengths, as printed by NEC2.
+    """
+    parts = line.split()
+    if len(parts) >= 10 and parts[0].isdigit() and parts[1].isdigit():
+        try:
+            seg, tag = int(parts[0]), int(parts[1])
+            x, y, z, _length, re_, im, mag, phase = map(float, parts[2:10])
+        except ValueError:
+            pass
+        else:
+            if math.isfinite(x + y + z + re_ + im + mag + phase):
+                return seg, tag, x, y, z, re_, im, mag, phase
+    if not parts or not parts[0][:1].isdigit():
+        return None
+    m = _CURRENT_LINE_RE.match(line)
+    if m is None:
+        return None
+    # group(6) is segment length, skip
+    return (
+        int(m.group(1)), int(m.group(2)),
+        float(m.group(3)), float(m.group(4)), float(m.group(5)),
+        float(m.group(7)), float(m.group(8)), float(m.group(9)), float(m.group(10)),
+    )
+
+
+# Pattern table as np.loadtxt reads it: the seven numeric columns, plus the
+# first byte of the polarization sense
+_PATTERN_TABLE_DTYPE = np.dtype([("values", np.float64, (7,)), ("sense", "S1")])
+# Bytes \w matches: what the sense column must start with
+_WORD_START = np.zeros(256, dtype=bool)
+_WORD_START[list(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")] = True
+
+
+def _pattern_table(block: list[bytes]) -> np.ndarray | None:
+    """(n, 3) theta, phi, total_db for a block of pattern lines, or None.
+
+    Parses the block with NumPy's C reader. Only succeeds if every line is a
+    row _split_pattern_row would accept on its fast path (so the result is
+    identical); anything else returns None and is parsed line by line.
+    """
+    try:
+        table = np.loadtxt(
+            block, dtype=_PATTERN_TABLE_DTYPE, usecols=range(8), comments=None, ndmin=1,
+        )
+    except ValueError:
+        return None
+    # loadtxt drops whitespace-only lines, which would have ended the section
+    if len(table) != len(block) or not _WORD_START[table["sense"].view(np.uint8)].all():
+        return None
+    points = table["values"][:, (0, 1, 4)]
+    if not np.isfinite(points[:, 0] + points[:, 1] + points[:, 2]).all():
+        return None
+    return points
+
+
+def _find_markers(
+    lines: list[bytes],
+    keywords: tuple[bytes, ...] = _MARKER_KEYWORDS,
+) -> dict[int, re.Match[bytes]]:
+    """Map line index -> first marker on that line.
+
+    Candidate lines are located with bytes.find over the upper-cased output
+    (fast literal scans in C); _MARKER_RE then only runs on those few lines
+    instead of on every one of the tens of thousands of data rows.
+    """
+    text = b"\n".join(lines)
+    upper = text.upper()
+
+    starts: set[int] = set()
+    for keyword in keywords:
+        pos = upper.find(keyword)
+        while pos != -1:
+            starts.add(pos)
+            pos = upper.find(keyword, pos + 1)
+
+    markers: dict[int, re.Match[bytes]] = {}
+    searched: set[int] = set()
+    line_idx = 0
+    prev = 0
+    for start in sorted(starts):
+        line_idx += text.count(b"\n", prev, start)
+        prev = start
+        if line_idx not in searched:
+            searched.add(line_idx)
+            m = _MARKER_RE.search(lines[line_idx])
+            if m is not None:
+                markers[line_idx] = m
+    return markers
+
+
 def parse_nec_output(
-    output: str,
+    output: bytes,
     n_theta: int,
     n_phi: int,
     theta_start: float,
@@ -317,32 +493,45 @@ def parse_nec_output(
 
     current_freq: float | None = None
     current_impedance: Impedance | None = None
-    current_pattern_data: list[tuple[float, float, float]] = []
+    # Pattern rows as one flat theta, phi, gain, theta, ... buffer, which
+    # becomes the (n, 3) array _build_frequency_result works on
+    current_pattern: list[float] = []
     current_power_radiated: float | None = None
     current_power_input: float | None = None
-    current_currents: list[SegmentCurrent] = []
+    # Raw (seg, tag, x, y, z, real, imag, mag, phase) rows, converted per
+    # frequency in _segment_currents
+    current_currents: list[_CurrentRow] = []
     in_input_params = False
     in_pattern_section = False
     in_current_section = False
+    try_pattern_table = False
     skip_header_lines = 0
 
-    for line in lines:
+    markers = _find_markers(
+        lines, _MARKER_KEYWORDS if compute_currents else _MARKER_KEYWORDS_NO_CURRENTS,
+    )
+    marker_lines = sorted(markers)
+
+    numbered = enumerate(lines)
+    for line_idx, line in numbered:
+        marker = markers.get(line_idx)
+        kind = marker.lastgroup if marker else None
+
         # Check for frequency header
-        freq_match = _FREQUENCY_RE.search(line)
-        if freq_match:
+        if marker is not None and kind == "freq":
             # Save previous frequency data
             if current_freq is not None and current_impedance is not None:
                 result = _build_frequency_result(
-                    current_freq, current_impedance, current_pattern_data,
+                    current_freq, current_impedance, current_pattern,
                     n_theta, n_phi, theta_start, theta_step, phi_start, phi_step,
                     current_power_radiated, current_power_input,
                     current_currents if compute_currents else None,
                 )
                 results.append(result)
 
-            current_freq = float(freq_match.group(1))
+            current_freq = float(marker.group("freq_mhz"))
             current_impedance = None
-            current_pattern_data = []
+            current_pattern = []
             current_power_radiated = None
             current_power_input = None
             current_currents = []
@@ -352,7 +541,7 @@ def parse_nec_output(
             continue
 
         # Check for antenna input parameters section
-        if _INPUT_PARAMS_RE.search(line):
+        if kind == "input_params":
             in_input_params = True
             in_pattern_section = False
             in_current_section = False
@@ -364,7 +553,7 @@ def parse_nec_output(
             if skip_header_lines > 0:
                 skip_header_lines -= 1
                 continue
-            imp_match = _IMPEDANCE_RE.search(line)
+            imp_match = _IMPEDANCE_RE.match(line)
             if imp_match:
                 z_real = float(imp_match.group(7))
                 z_imag = float(imp_match.group(8))
@@ -372,11 +561,11 @@ def parse_nec_output(
                 in_input_params = False
                 continue
             # If we hit a blank line or non-matching line, stop looking
-            if line.strip() == "":
+            if not line or line.isspace():
                 continue
 
         # Check for current distribution section
-        if compute_currents and _CURRENT_HEADER_RE.search(line):
+        if compute_currents and kind == "currents":
             in_current_section = True
             in_pattern_section = False
             in_input_params = False
@@ -388,43 +577,19 @@ def parse_nec_output(
             if skip_header_lines > 0:
                 skip_header_lines -= 1
                 continue
-            cur_match = _CURRENT_LINE_RE.search(line)
-            if cur_match:
-                seg_num = int(cur_match.group(1))
-                tag_num = int(cur_match.group(2))
-                # NEC2 reports segment positions in wavelengths — convert to meters
-                cx_wl = float(cur_match.group(3))
-                cy_wl = float(cur_match.group(4))
-                cz_wl = float(cur_match.group(5))
-                wavelength_m = 299.792458 / current_freq if current_freq and current_freq > 0 else 1.0
-                cx = cx_wl * wavelength_m
-                cy = cy_wl * wavelength_m
-                cz = cz_wl * wavelength_m
-                # group(6) is segment length, skip
-                c_real = float(cur_match.group(7))
-                c_imag = float(cur_match.group(8))
-                c_mag = float(cur_match.group(9))
-                c_phase = float(cur_match.group(10))
-                current_currents.append(SegmentCurrent(
-                    tag=tag_num,
-                    segment=seg_num,
-                    x=round(cx, 6),
-                    y=round(cy, 6),
-                    z=round(cz, 6),
-                    current_real=round(c_real, 8),
-                    current_imag=round(c_imag, 8),
-                    current_magnitude=round(c_mag, 8),
-                    current_phase_deg=round(c_phase, 2),
-                ))
+            row = _split_current_row(line)
+            if row is not None:
+                current_currents.append(row)
                 continue
-            if line.strip() == "":
+            if not line or line.isspace():
                 in_current_section = False
 
         # Check for radiation pattern section
-        if _PATTERN_HEADER_RE.search(line):
+        if kind == "pattern":
             in_pattern_section = True
             in_input_params = False
             in_current_section = False
+            try_pattern_table = True
             skip_header_lines = 3  # Skip header lines (column headers)
             continue
 
@@ -433,32 +598,44 @@ def parse_nec_output(
             if skip_header_lines > 0:
                 skip_header_lines -= 1
                 continue
-            pat_match = _PATTERN_LINE_RE.search(line)
-            if pat_match:
-                theta = float(pat_match.group(1))
-                phi = float(pat_match.group(2))
-                total_db = float(pat_match.group(5))
-                current_pattern_data.append((theta, phi, total_db))
+            point = _split_pattern_row(line)
+            if point is not None:
+                if try_pattern_table:
+                    # From its first row up to the blank line that ends it, the
+                    # pattern is normally one unbroken table: parse it in one
+                    # go and skip past it
+                    try_pattern_table = False
+                    try:
+                        end = lines.index(b"", line_idx)
+                    except ValueError:
+                        end = len(lines)
+                    m_idx = bisect_left(marker_lines, line_idx)
+                    if m_idx == len(marker_lines) or marker_lines[m_idx] >= end:
+                        table = _pattern_table(lines[line_idx:end])
+                        if table is not None:
+                            current_pattern.extend(table.ravel().tolist())
+                            skip = end - line_idx - 1
+                            next(islice(numbered, skip, skip), None)
+                            continue
+                current_pattern.extend(point)
                 continue
             # If the line is blank or doesn't match, end pattern section
-            if line.strip() == "":
+            if not line or line.isspace():
                 in_pattern_section = False
 
         # Parse power budget lines (can appear anywhere in output)
-        pwr_rad_match = _POWER_RADIATED_RE.search(line)
-        if pwr_rad_match:
-            current_power_radiated = float(pwr_rad_match.group(1))
+        if marker is not None and kind == "power_radiated":
+            current_power_radiated = float(marker.group("radiated_w"))
             continue
 
-        pwr_in_match = _POWER_INPUT_RE.search(line)
-        if pwr_in_match:
-            current_power_input = float(pwr_in_match.group(1))
+        if marker is not None and kind == "power_input":
+            current_power_input = float(marker.group("input_w"))
             continue
 
     # Don't forget the last frequency
     if current_freq is not None and current_impedance is not None:
         result = _build_frequency_result(
-            current_freq, current_impedance, current_pattern_data,
+            current_freq, current_impedance, current_pattern,
             n_theta, n_phi, theta_start, theta_step, phi_start, phi_step,
             current_power_radiated, current_power_input,
             current_currents if compute_currents else None,
@@ -468,10 +645,62 @@ def parse_nec_output(
     return results
 
 
+def _round_array(values: np.ndarray, ndigits: int) -> list[Any]:
+    """round(v, ndigits) for every element of values, as a (nested) list.
+
+    Scale-and-rint matches round() except when the scaled value lands on or
+    next to a .5 tie (common for 5-digit NEC values rounded to 8 places),
+    where round() decides on the exact binary value; those few elements
+    are re-rounded with round() itself.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(np.abs(scaled), 1.0)
+    if ties.any():
+        rounded[ties] = [round(v, ndigits) for v in values[ties].tolist()]
+    result: list[Any] = rounded.tolist()
+    return result
+
+
+def _segment_currents(rows: list[_CurrentRow], freq_mhz: float) -> list[SegmentCurrent]:
+    """SegmentCurrents for one frequency's current rows.
+
+    Positions are converted from wavelengths to meters and each column is
+    rounded in one vectorized pass instead of seven round() calls per segment.
+    The rows are built as plain dicts and validated as one list, a single
+    pydantic-core call instead of one SegmentCurrent(...) call per segment.
+    """
+    # NEC2 reports segment positions in wavelengths — convert to meters
+    wavelength_m = 299.792458 / freq_mhz if freq_mhz > 0 else 1.0
+    # Column-wise (SoA): seg/tag stay Python ints, the seven float columns
+    # become one (7, n) array
+    segs, tags, *columns = zip(*rows)
+    cols = np.array(columns, dtype=np.float64)
+    xs, ys, zs = _round_array(cols[0:3] * wavelength_m, 6)
+    reals, imags, mags = _round_array(cols[3:6], 8)
+    phases = _round_array(cols[6], 2)
+    return _SEGMENT_CURRENTS_ADAPTER.validate_python([
+        {
+            "tag": tag,
+            "segment": seg,
+            "x": x,
+            "y": y,
+            "z": z,
+            "current_real": c_real,
+            "current_imag": c_imag,
+            "current_magnitude": c_mag,
+            "current_phase_deg": c_phase,
+        }
+        for seg, tag, x, y, z, c_real, c_imag, c_mag, c_phase
+        in zip(segs, tags, xs, ys, zs, reals, imags, mags, phases)
+    ])
+
+
 def _build_frequency_result(
     freq_mhz: float,
     impedance: Impedance,
-    pattern_data: list[tuple[float, float, float]],
+    pattern_values: list[float],
     n_theta: int,
     n_phi: int,
     theta_start: float,
@@ -480,7 +709,7 @@ def _build_frequency_result(
     phi_step: float,
     power_radiated: float | None = None,
     power_input: float | None = None,
-    currents: list[SegmentCurrent] | None = None,
+    currents: list[_CurrentRow] | None = None,
 ) -> FrequencyResult:
     """Build a FrequencyResult from parsed data."""
     swr = compute_swr(impedance.real, impedance.imag)
@@ -490,62 +719,79 @@ def _build_frequency_result(
     gain_max_theta = 0.0
     gain_max_phi = 0.0
 
-    if pattern_data:
-        gain_grid: list[list[float]] = [
-            [-999.99] * n_phi for _ in range(n_theta)
-        ]
-
-        for theta, phi, gain_db in pattern_data:
-            ti = round((theta - theta_start) / theta_step)
-            pi = round((phi - phi_start) / phi_step)
-            if 0 <= ti < n_theta and 0 <= pi < n_phi:
-                gain_grid[ti][pi] = gain_db
-                if gain_db > gain_max_dbi:
-                    gain_max_dbi = gain_db
-                    gain_max_theta = theta
-                    gain_max_phi = phi
-
-        pattern = PatternData(
-            theta_start=theta_start,
-            theta_step=theta_step,
+    if pattern_values:
+        # Scatter the (theta, phi, gain) rows onto the grid in one vectorized
+        # pass; np.rint rounds half to even, like round() did
+        points = np.array(pattern_values, dtype=np.float64).reshape(-1, 3)
+        thetas, phis, gains = points[:, 0], points[:, 1], points[:, 2]
+        ti = np.rint((thetas - theta_start) / theta_step).astype(np.intp)
+        pi = np.rint((phis - phi_start) / phi_step).astype(np.intp)
+        on_grid = np.flatnonzero((ti >= 0) & (ti < n_theta) & (pi >= 0) & (pi < n_phi))
+
+        grid = np.full((n_theta, n_phi), -999.99)
+        grid[ti[on_grid], pi[on_grid]] = gains[on_grid]
+        gain_grid = grid.tolist()
+
+        # Peak over the on-grid rows; argmax keeps the first of equal maxima
+        if on_grid.size:
+            peak = on_grid[np.argmax(gains[on_grid])]
+            if gains[peak] > gain_max_dbi:
+                gain_max_dbi = float(gains[peak])
+                gain_max_theta = float(thetas[peak])
+                gain_max_phi = float(phis[peak])
+
+        # The grid is built here from parsed floats: skip re-validating every
+        # cell (theta_count * phi_count values) and just coerce the scalars
+        pattern = PatternData.model_construct(
+            theta_start=float(theta_start),
+            theta_step=float(theta_step),
             theta_count=n_theta,
-            phi_start=phi_start,
-            phi_step=phi_step,
+            phi_start=float(phi_start),
+            phi_step=float(phi_step),
             phi_count=n_phi,
             gain_dbi=gain_grid,
         )
 
-    # Front-to-back ratio
+    # Front-to-back ratio and beamwidth (E-plane and H-plane)
     front_to_back: float | None = None
-    if pattern_data and gain_max_dbi > -999.0:
+    beamwidth_e: float | None = None
+    beamwidth_h: float | None = None
+    if pattern_values and gain_max_dbi > -999.0:
         back_phi = (gain_max_phi + 180.0) % 360.0
-        back_gain = -999.99
-        for theta, phi, gain_db in pattern_data:
-            if (abs(theta - gain_max_theta) < theta_step * 0.6
-                    and abs(phi - back_phi) < phi_step * 0.6):
-                back_gain = max(back_gain, gain_db)
+        back = gains[
+            (np.abs(thetas - gain_max_theta) < theta_step * 0.6)
+            & (np.abs(phis - back_phi) < phi_step * 0.6)
+        ]
+        back_gain = max(-999.99, float(back.max())) if back.size else -999.99
         if back_gain > -999.0:
             front_to_back = round(gain_max_dbi - back_gain, 2)
 
-    # Beamwidth (E-plane and H-plane)
-    beamwidth_e: float | None = None
-    beamwidth_h: float | None = None
-    if pattern_data and gain_max_dbi > -999.0:
-        beamwidth_e, beamwidth_h = _compute_beamwidth(
-            pattern_data, gain_max_dbi, gain_max_theta, gain_max_phi,
-            theta_step, phi_step,
-        )
+        # With one row per grid cell (always the case for nec2c output) the
+        # cuts come straight off the parsed arrays; otherwise fall back to
+        # the dict-based dedup in _compute_beamwidth
+        if on_grid.size == len(points) and np.bincount(
+            ti * n_phi + pi, minlength=n_theta * n_phi
+        ).max() <= 1:
+            beamwidth_e, beamwidth_h = _compute_beamwidth_grid(
+                thetas, phis, gains, gain_max_dbi, gain_max_theta, gain_max_phi,
+                theta_step, phi_step,
+            )
+        else:
+            beamwidth_e, beamwidth_h = _compute_beamwidth(
+                points.tolist(), gain_max_dbi, gain_max_theta, gain_max_phi,
+                theta_step, phi_step,
+            )
 
     # Efficiency from pattern integration: η = (1/4π) ∫∫ G(θ,φ) sinθ dθ dφ.
     # For a lossless antenna this equals 1.0 (100%). Ground absorption reduces it.
     # Uses exact solid angle elements: ΔΩ = |cos(θ-dθ/2) - cos(θ+dθ/2)| × dφ
     efficiency: float | None = None
-    if pattern_data:
+    if pattern_values:
         half_dth = math.radians(theta_step / 2.0)
         dph = math.radians(phi_step)
         weighted_gain = 0.0
         total_weight = 0.0
-        for theta, _phi, gain_db in pattern_data:
+        for theta, gain_db in zip(thetas.tolist(), gains.tolist()):
             theta_rad = math.radians(theta)
             gain_linear = 10.0 ** (gain_db / 10.0) if gain_db > -999.0 else 0.0
             w = abs(math.cos(theta_rad - half_dth) - math.cos(theta_rad + half_dth)) * dph
@@ -571,5 +817,5 @@ def _build_frequency_result(
         beamwidth_h_deg=beamwidth_h,
         efficiency_percent=efficiency,
         pattern=pattern,
-        currents=currents if currents else None,
+        currents=_segment_currents(currents, freq_mhz) if currents else None,
     )
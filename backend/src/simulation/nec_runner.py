@@ -2,6 +2,7 @@
 
 import logging
 import os
+import shutil
 import subprocess
 import tempfile
 import uuid
@@ -11,6 +12,19 @@ from src.config import settings
 
 logger = logging.getLogger("antsim.nec_runner")
 
+# Resolved once at import: spawns exec the absolute path instead of searching
+# PATH each time (None if nec2c isn't installed)
+NEC2C_PATH: str | None = shutil.which("nec2c")
+
+# Workdir roots used when settings.nec_workdir is unset
+_SHM_WORKDIR = Path("/dev/shm/antsim")
+_DEFAULT_WORKDIR = Path("/tmp/nec_workdir")
+
+# Per-process workdir, created once and reused by every run (files are named
+# by run id); re-resolved if the process is forked after first use
+_workdir: Path | None = None
+_workdir_pid = 0
+
 
 class NecExecutionError(Exception):
     """Raised when nec2c execution fails."""
@@ -21,13 +35,37 @@ class NecExecutionError(Exception):
         super().__init__(message)
 
 
-def run_nec2c(card_deck: str) -> str:
-    """Execute nec2c with the given card deck and return stdout.
+def _base_workdir() -> Path:
+    """settings.nec_workdir, or a tmpfs-backed default when it's unset.
+
+    nec2c output is written once and read straight back, so keeping it in
+    RAM trades a few MB per concurrent run for never touching the disk.
+    """
+    if settings.nec_workdir:
+        return Path(settings.nec_workdir)
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return _SHM_WORKDIR
+    return _DEFAULT_WORKDIR
+
+
+def _get_workdir() -> Path:
+    """This process's nec2c workdir under the configured root."""
+    global _workdir, _workdir_pid
+    pid = os.getpid()
+    if _workdir is None or _workdir_pid != pid:
+        workdir = _base_workdir() / f"w{pid}"
+        workdir.mkdir(parents=True, exist_ok=True)
+        _workdir, _workdir_pid = workdir, pid
+    return _workdir
+
+
+def run_nec2c(card_deck: str) -> bytes:
+    """Execute nec2c with the given card deck and return its output.
 
     Security measures:
     - shell=False always
     - Timeout enforced
-    - Temp files in dedicated workdir with UUID subdirectory
+    - Temp files named by a per-run UUID in a per-process workdir
     - Cleanup in finally block
     - No user input interpolated into commands
 
@@ -35,28 +73,30 @@ def run_nec2c(card_deck: str) -> str:
         card_deck: Complete NEC2 input file content.
 
     Returns:
-        The nec2c stdout output as a string.
+        The raw nec2c output (ASCII) as bytes.
 
     Raises:
         NecExecutionError: If nec2c fails or times out.
     """
     run_id = uuid.uuid4().hex[:12]
-    workdir = Path(settings.nec_workdir) / run_id
-    input_file = workdir / "input.nec"
-    output_file = workdir / "input.out"
+    workdir = _get_workdir()
+    input_file = workdir / f"{run_id}.nec"
+    output_file = workdir / f"{run_id}.out"
 
     try:
-        # Create isolated workdir
-        workdir.mkdir(parents=True, exist_ok=True)
-
         # Write card deck to input file
-        input_file.write_text(card_deck, encoding="ascii")
+        try:
+            input_file.write_text(card_deck, encoding="ascii")
+        except FileNotFoundError:
+            # Workdir removed underneath us (e.g. a tmp cleaner) — recreate it
+            workdir.mkdir(parents=True, exist_ok=True)
+            input_file.write_text(card_deck, encoding="ascii")
 
         logger.debug("Running nec2c: run_id=%s, workdir=%s", run_id, workdir)
 
         # Execute nec2c — NEVER shell=True
         result = subprocess.run(
-            ["nec2c", "-i", str(input_file), "-o", str(output_file)],
+            [NEC2C_PATH or "nec2c", "-i", str(input_file), "-o", str(output_file)],
             capture_output=True,
             text=True,
             timeout=settings.sim_timeout_seconds,
@@ -79,21 +119,22 @@ def run_nec2c(card_deck: str) -> str:
         if result.stderr.strip():
             logger.warning("nec2c stderr: %s", result.stderr[:500])
 
-        # Read output file
-        if not output_file.exists():
+        # Read output file as raw bytes: NEC output is plain ASCII and the
+        # parser works on bytes, so it's never decoded
+        try:
+            output = output_file.read_bytes()
+        except FileNotFoundError:
             raise NecExecutionError(
                 "nec2c produced no output file",
                 stderr=result.stderr[:500],
             )
 
-        output = output_file.read_text(encoding="ascii", errors="replace")
-
         # Check for NEC2 geometry errors in output
-        if "GEOMETRY DATA ERROR" in output:
+        if b"GEOMETRY DATA ERROR" in output:
             raise NecExecutionError(
                 "NEC2 geometry data error — check wire definitions"
             )
-        if "SEGMENT DATA ERROR" in output:
+        if b"SEGMENT DATA ERROR" in output:
             raise NecExecutionError(
                 "NEC2 segment data error — check segmentation"
             )
@@ -111,13 +152,9 @@ def run_nec2c(card_deck: str) -> str:
         )
 
     finally:
-        # ALWAYS clean up temp files
+        # ALWAYS clean up temp files (the workdir itself is reused)
         try:
-            if output_file.exists():
-                output_file.unlink()
-            if input_file.exists():
-                input_file.unlink()
-            if workdir.exists():
-                workdir.rmdir()
+            output_file.unlink(missing_ok=True)
+            input_file.unlink(missing_ok=True)
         except OSError as e:
-            logger.warning("Cleanup failed for %s: %s", workdir, e)
+            logger.warning("Cleanup failed for %s: %s", run_id, e)
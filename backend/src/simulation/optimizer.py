@@ -1,81 +1,246 @@
-"""Antenna parameter optimizer using Nelder-Mead.
+"""Antenna parameter optimizer using Nelder-Mead or a Bayesian surrogate.
 
 Each iteration runs a full NEC2 simulation and evaluates the objective function.
 Supports optimization of wire coordinates, lengths, spacings, and heights.
 """
 
-import copy
+import hashlib
 import logging
+import threading
 import time
+from collections import OrderedDict
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
 
-from scipy.optimize import minimize
+from pydantic import TypeAdapter
+from scipy.optimize import OptimizeResult, differential_evolution, minimize
 
+from src.config import settings
 from src.models.optimization import (
+    OptimizationMethod,
     OptimizationRequest,
     OptimizationVariable,
     OptimizationObjective,
     OptimizationResult,
     OptimizationProgress,
 )
-from src.simulation.nec_input import build_card_deck
+from src.simulation.nec_input import build_card_deck, build_wire_card
 from src.simulation.nec_runner import run_nec2c, NecExecutionError
 from src.simulation.nec_output import parse_nec_output
-from src.models.simulation import SimulationRequest, FrequencyConfig
+from src.simulation.surrogate import gp_minimize
+from src.models.simulation import SimulationRequest, FrequencyConfig, PatternConfig
 from src.models.antenna import Wire, Excitation
 from src.models.ground import GroundConfig
 
 logger = logging.getLogger("antsim.optimizer")
 
+# Differential evolution population per variable: small, so that a run gets
+# through several generations within max_iterations evaluations
+_DE_POPSIZE = 5
 
-def _apply_variables(
+# Radiation pattern per evaluation, and the grid it's parsed on. Objectives
+# that only read SWR get a single direction: the RP card still triggers the
+# NEC2 run, but there's no pattern to compute or parse
+_FULL_PATTERN = PatternConfig()
+_FULL_GRID = dict(n_theta=37, n_phi=73, theta_start=-90, theta_step=5, phi_start=0, phi_step=5)
+_SWR_ONLY_PATTERN = PatternConfig(theta_start=0.0, theta_stop=0.0, phi_start=0.0, phi_stop=0.0)
+_SWR_ONLY_GRID = dict(n_theta=1, n_phi=1, theta_start=0, theta_step=5, phi_start=0, phi_step=5)
+
+
+class _FrequencySummary(NamedTuple):
+    """The FrequencyResult fields the objectives read."""
+    frequency_mhz: float
+    swr_50: float
+    gain_max_dbi: float
+    front_to_back_db: float | None
+
+
+# Objective inputs of recent NEC2 runs by card deck digest, per worker: a
+# deck seen before (a re-run of the same optimization, or linked variables
+# landing on the same geometry) skips nec2c. ~100 bytes per frequency.
+_run_cache: OrderedDict[bytes, list[_FrequencySummary]] = OrderedDict()
+_RUN_CACHE_MAX = 1024
+_run_cache_lock = threading.Lock()
+
+# Built once at import; every cost evaluation reuses the compiled validators
+_WIRE_LIST_ADAPTER = TypeAdapter(list[Wire])
+_EXCITATION_LIST_ADAPTER = TypeAdapter(list[Excitation])
+
+
+# Per variable: (wire index, field, (linked wire index, linked field), link factor),
+# with None for a tag that matches no wire or an unset link
+_VariablePlan = list[tuple[int | None, str, tuple[int, str] | None, float]]
+
+
+def _plan_variables(
     wires: list[dict],
     variables: list[OptimizationVariable],
+) -> _VariablePlan:
+    """Resolve each variable's wire tags to list indices, once per run."""
+    tag_index: dict[int, int] = {}
+    for i, w in enumerate(wires):
+        tag_index.setdefault(w["tag"], i)  # First wire with the tag wins
+
+    plan: _VariablePlan = []
+    for var in variables:
+        linked: tuple[int, str] | None = None
+        if var.linked_wire_tag is not None and var.linked_field is not None:
+            linked_idx = tag_index.get(var.linked_wire_tag)
+            if linked_idx is not None:
+                linked = (linked_idx, var.linked_field)
+        plan.append((tag_index.get(var.wire_tag), var.field, linked, var.link_factor))
+    return plan
+
+
+def _apply_variables(
+    wires: list[dict],
+    plan: _VariablePlan,
     values: list[float],
 ) -> list[dict]:
-    """Apply optimization variable values to wire list."""
-    wires = copy.deepcopy(wires)
+    """Apply optimization variable values to wire list.
 
-    for var, val in zip(variables, values):
-        # Find the wire by tag
-        for w in wires:
-            if w["tag"] == var.wire_tag:
-                w[var.field] = val
-                break
+    Returns a new list. Only the wires a variable changes are copied; the
+    rest are shared with the input, which is left untouched.
+    """
+    wires = list(wires)
+    copied: set[int] = set()
+
+    def set_field(i: int, field: str, val: float) -> None:
+        if i not in copied:
+            wires[i] = dict(wires[i])
+            copied.add(i)
+        wires[i][field] = val
+
+    for (idx, field, linked, link_factor), val in zip(plan, values):
+        if idx is not None:
+            set_field(idx, field, val)
 
         # Apply linked variables (symmetry)
-        if var.linked_wire_tag is not None and var.linked_field is not None:
-            for w in wires:
-                if w["tag"] == var.linked_wire_tag:
-                    w[var.linked_field] = val * var.link_factor
-                    break
+        if linked is not None:
+            set_field(linked[0], linked[1], val * link_factor)
 
     return wires
 
 
+def _wire_key(w: Wire) -> tuple[float, ...]:
+    """A wire's endpoints (to 1e-6 m), the same whichever end comes first.
+
+    Two wires with the same key overlap: NEC2 would model them on top of
+    each other, the interaction matrix is singular and the run's results
+    are meaningless.
+    """
+    a = (round(w.x1, 6), round(w.y1, 6), round(w.z1, 6))
+    b = (round(w.x2, 6), round(w.y2, 6), round(w.z2, 6))
+    return a + b if a <= b else b + a
+
+
+class _BaseWires(NamedTuple):
+    """A run's wires that no variable changes, validated and formatted once.
+
+    Evaluations only redo the `changed` wires; the other lists hold None
+    (or "") at those indices.
+    """
+    changed: list[int]
+    models: list[Wire | None]
+    keys: list[tuple[float, ...] | None]
+    cards: list[str]
+
+
+def _prepare_base_wires(wires: list[dict], plan: _VariablePlan) -> _BaseWires | None:
+    """_BaseWires for a run, or None if an unchanging wire is invalid."""
+    changed = sorted(
+        {idx for idx, _, _, _ in plan if idx is not None}
+        | {linked[0] for _, _, linked, _ in plan if linked is not None}
+    )
+    skip = set(changed)
+    try:
+        models = [None if i in skip else Wire.model_validate(w) for i, w in enumerate(wires)]
+    except Exception:
+        return None  # Every evaluation would fail; _evaluate_objective reports it
+    return _BaseWires(
+        changed,
+        models,
+        [None if m is None else _wire_key(m) for m in models],
+        ["" if m is None else build_wire_card(m) for m in models],
+    )
+
+
+def _closest_to_target(
+    request: OptimizationRequest,
+    freq_data: list[_FrequencySummary],
+) -> _FrequencySummary:
+    """The frequency point closest to the target (or center) frequency."""
+    if len(freq_data) == 1:
+        return freq_data[0]  # Single-frequency run (see _evaluate_objective)
+    target = request.target_frequency_mhz or (
+        (request.frequency_start_mhz + request.frequency_stop_mhz) / 2
+    )
+    return min(freq_data, key=lambda d: abs(d.frequency_mhz - target))
+
+
 def _evaluate_objective(
     request: OptimizationRequest,
     wires: list[dict],
+    base: _BaseWires | None = None,
 ) -> float:
     """Run a NEC2 simulation and compute the objective function value.
 
+    With base, only the wires it marks as changed are validated and
+    formatted; the rest are taken from it.
+
     Returns a scalar cost that the optimizer tries to minimize.
     """
     # Build a SimulationRequest
     try:
-        wire_models = [Wire(**w) for w in wires]
+        if base is None:
+            wire_models = _WIRE_LIST_ADAPTER.validate_python(wires)
+        else:
+            # The base holds None exactly at the changed wires
+            wire_models = [
+                Wire.model_validate(wires[i]) if m is None else m
+                for i, m in enumerate(base.models)
+            ]
     except Exception as e:
         logger.warning("Invalid wire geometry during optimization: %s", e)
         return 1e6  # Penalty for invalid geometry
 
-    excitation_models = [Excitation(**e) for e in request.excitations]
+    if base is None:
+        keys = [_wire_key(w) for w in wire_models]
+        wire_cards = None
+    else:
+        keys = [
+            _wire_key(wire_models[i]) if k is None else k for i, k in enumerate(base.keys)
+        ]
+        cards = list(base.cards)
+        for i in base.changed:
+            cards[i] = build_wire_card(wire_models[i])
+        wire_cards = "".join(cards)
+
+    if len(set(keys)) < len(keys):
+        return 1e6  # Overlapping wires: same penalty, no point running NEC2 on it
+
+    excitation_models = _EXCITATION_LIST_ADAPTER.validate_python(request.excitations)
 
     ground_config = GroundConfig(**request.ground) if request.ground else GroundConfig()
 
-    freq_config = FrequencyConfig(
-        start_mhz=request.frequency_start_mhz,
-        stop_mhz=request.frequency_stop_mhz,
-        steps=request.frequency_steps,
+    objective = request.objective
+    target_mhz = request.target_frequency_mhz
+    if target_mhz is not None and objective != OptimizationObjective.MIN_SWR_BAND:
+        # Single-frequency objectives only read the point closest to the
+        # target, so simulate just the target
+        freq_config = FrequencyConfig(start_mhz=target_mhz, stop_mhz=target_mhz, steps=1)
+    else:
+        freq_config = FrequencyConfig(
+            start_mhz=request.frequency_start_mhz,
+            stop_mhz=request.frequency_stop_mhz,
+            steps=request.frequency_steps,
+        )
+
+    swr_only = objective in (OptimizationObjective.MIN_SWR, OptimizationObjective.MIN_SWR_BAND) or (
+        objective == OptimizationObjective.COMBINED
+        and request.weights.gain_weight == 0
+        and request.weights.fb_weight == 0
     )
 
     sim_request = SimulationRequest(
@@ -83,41 +248,50 @@ def _evaluate_objective(
         excitations=excitation_models,
         ground=ground_config,
         frequency=freq_config,
+        pattern=_SWR_ONLY_PATTERN if swr_only else _FULL_PATTERN,
         comment="optimizer iteration",
     )
 
-    card_deck = build_card_deck(sim_request)
+    card_deck = build_card_deck(sim_request, wire_cards=wire_cards)
+    deck_key = hashlib.blake2b(card_deck.encode(), digest_size=16).digest()
+
+    with _run_cache_lock:
+        freq_data = _run_cache.get(deck_key)
+        if freq_data is not None:
+            _run_cache.move_to_end(deck_key)
+
+    if freq_data is None:
+        try:
+            output = run_nec2c(card_deck)
+        except NecExecutionError:
+            return 1e6  # Penalty for failed sim
+
+        try:
+            results = parse_nec_output(
+                output,
+                **(_SWR_ONLY_GRID if swr_only else _FULL_GRID),
+                compute_currents=False,
+            )
+        except Exception:
+            return 1e6
 
-    try:
-        output = run_nec2c(card_deck)
-    except NecExecutionError:
-        return 1e6  # Penalty for failed sim
+        if not results:
+            return 1e6
 
-    try:
-        freq_data = parse_nec_output(
-            output,
-            n_theta=37, n_phi=73,
-            theta_start=-90, theta_step=5,
-            phi_start=0, phi_step=5,
-            compute_currents=False,
-        )
-    except Exception:
-        return 1e6
-
-    if not freq_data:
-        return 1e6
+        freq_data = [
+            _FrequencySummary(d.frequency_mhz, d.swr_50, d.gain_max_dbi, d.front_to_back_db)
+            for d in results
+        ]
+        with _run_cache_lock:
+            _run_cache[deck_key] = freq_data
+            if len(_run_cache) > _RUN_CACHE_MAX:
+                _run_cache.popitem(last=False)
 
     # Compute cost based on objective
-    objective = request.objective
 
     if objective == OptimizationObjective.MIN_SWR:
         # Minimize SWR at target frequency (or center frequency)
-        target = request.target_frequency_mhz or (
-            (request.frequency_start_mhz + request.frequency_stop_mhz) / 2
-        )
-        # Find closest frequency point
-        closest = min(freq_data, key=lambda d: abs(d.frequency_mhz - target))
-        return closest.swr_50
+        return _closest_to_target(request, freq_data).swr_50
 
     elif objective == OptimizationObjective.MIN_SWR_BAND:
         # Minimize average SWR across all frequencies
@@ -126,28 +300,19 @@ def _evaluate_objective(
 
     elif objective == OptimizationObjective.MAX_GAIN:
         # Maximize gain (minimize negative gain)
-        target = request.target_frequency_mhz or (
-            (request.frequency_start_mhz + request.frequency_stop_mhz) / 2
-        )
-        closest = min(freq_data, key=lambda d: abs(d.frequency_mhz - target))
+        closest = _closest_to_target(request, freq_data)
         return -closest.gain_max_dbi  # Negate because we're minimizing
 
     elif objective == OptimizationObjective.MAX_FB:
         # Maximize front-to-back ratio
-        target = request.target_frequency_mhz or (
-            (request.frequency_start_mhz + request.frequency_stop_mhz) / 2
-        )
-        closest = min(freq_data, key=lambda d: abs(d.frequency_mhz - target))
+        closest = _closest_to_target(request, freq_data)
         fb = closest.front_to_back_db if closest.front_to_back_db else 0
         return -fb  # Negate
 
     elif objective == OptimizationObjective.COMBINED:
         # Weighted combination
         w = request.weights
-        target = request.target_frequency_mhz or (
-            (request.frequency_start_mhz + request.frequency_stop_mhz) / 2
-        )
-        closest = min(freq_data, key=lambda d: abs(d.frequency_mhz - target))
+        closest = _closest_to_target(request, freq_data)
         cost = 0.0
         if w.swr_weight > 0:
             cost += w.swr_weight * closest.swr_50
@@ -161,13 +326,46 @@ def _evaluate_objective(
     return 1e6
 
 
+def _differential_evolution(
+    objective_fn: Callable[[list[float]], float],
+    x0: list[float],
+    bounds: list[tuple[float, float]],
+    max_evals: int,
+) -> OptimizeResult:
+    """scipy differential_evolution, evaluating each generation in parallel.
+
+    Candidates are handed to a thread pool: the work is in the nec2c
+    subprocess, which doesn't hold the GIL. Generations are sized so the
+    run spends about max_evals evaluations (at least two generations).
+    """
+    generations = max(1, max_evals // (_DE_POPSIZE * len(bounds)) - 1)
+    x0 = [max(b[0], min(b[1], v)) for v, b in zip(x0, bounds)]
+    with ThreadPoolExecutor(max_workers=settings.optimizer_workers) as pool:
+        return differential_evolution(
+            objective_fn,
+            bounds,
+            x0=x0,
+            popsize=_DE_POPSIZE,
+            maxiter=generations,
+            tol=0.001,
+            polish=False,
+            updating="deferred",
+            workers=pool.map,
+            seed=0,
+        )
+
+
 def run_optimization(
     request: OptimizationRequest,
     on_progress: Callable[[OptimizationProgress], None] | None = None,
 ) -> OptimizationResult:
     """Run the optimizer.
 
-    Uses scipy.optimize.minimize with Nelder-Mead method.
+    Uses scipy.optimize.minimize with Nelder-Mead method, or for
+    method="bayesian" a Gaussian-process surrogate (surrogate.gp_minimize)
+    that spends at most max_iterations evaluations. method=
+    "differential_evolution" evaluates each generation's candidates
+    concurrently (settings.optimizer_workers NEC2 runs at a time).
     Each function evaluation runs a full NEC2 simulation.
 
     Args:
@@ -178,99 +376,123 @@ def run_optimization(
         OptimizationResult with optimized wire values and history.
     """
     variables = request.variables
-    history: list[dict] = []
+    # (rounded point, cost) per evaluation, in call order; the history dicts
+    # are only built for the result
+    evaluated: list[tuple[tuple[float, ...], float]] = []
     best_cost = float("inf")
     best_values: dict[str, float] = {}
     iteration_count = 0
 
+    # Wire lookups, resolved once: for x0 below and for objective_fn
+    plan = _plan_variables(request.wires, variables)
+    base_wires = _prepare_base_wires(request.wires, plan)
+
     # Initial values
     x0: list[float] = []
     bounds: list[tuple[float, float]] = []
     var_names: list[str] = []
 
-    for var in variables:
+    for var, (idx, *_) in zip(variables, plan):
         if var.initial_value is not None:
             x0.append(var.initial_value)
-        else:
+        elif idx is not None:
             # Use current value from wire list
-            for w in request.wires:
-                if w["tag"] == var.wire_tag:
-                    x0.append(w.get(var.field, (var.min_value + var.max_value) / 2))
-                    break
-            else:
-                x0.append((var.min_value + var.max_value) / 2)
+            x0.append(request.wires[idx].get(var.field, (var.min_value + var.max_value) / 2))
+        else:
+            x0.append((var.min_value + var.max_value) / 2)
 
         bounds.append((var.min_value, var.max_value))
         var_names.append(f"{var.wire_tag}.{var.field}")
 
+    lows = [b[0] for b in bounds]
+    highs = [b[1] for b in bounds]
+
     logger.info(
         "Starting optimization: %d variables, %s objective, max %d iterations",
         len(variables), request.objective, request.max_iterations,
     )
 
+    # Cost per clamped point (rounded to 1e-6, as reported): the simplex
+    # often revisits a point, e.g. when several vertices clamp to a bound,
+    # and _evaluate_objective is deterministic, so skip the repeat NEC2 run
+    cost_cache: dict[tuple[float, ...], float] = {}
+    # Guards the bookkeeping below: differential evolution calls objective_fn
+    # from several threads at once
+    lock = threading.Lock()
+
     def objective_fn(x: list[float]) -> float:
         nonlocal best_cost, iteration_count
-        iteration_count += 1
 
         # Clamp to bounds
-        x_clamped = [
-            max(b[0], min(b[1], v)) for v, b in zip(x, bounds)
-        ]
-
-        # Apply variables to wires
-        modified_wires = _apply_variables(request.wires, variables, x_clamped)
-
-        # Evaluate
-        cost = _evaluate_objective(request, modified_wires)
-
-        # Track history
-        current_values = {name: round(val, 6) for name, val in zip(var_names, x_clamped)}
-        if cost < best_cost:
-            best_cost = cost
-            best_values.update(current_values)
-
-        history.append({
-            "iteration": iteration_count,
-            "cost": round(cost, 4),
-            "values": current_values,
-        })
-
-        if iteration_count % 10 == 0:
-            logger.info(
-                "Optimizer iteration %d: cost=%.4f, best=%.4f",
-                iteration_count, cost, best_cost,
-            )
-
-        # Emit progress callback
-        if on_progress is not None:
-            try:
-                on_progress(OptimizationProgress(
-                    iteration=iteration_count,
-                    total_iterations=request.max_iterations,
-                    current_cost=round(cost, 4),
-                    best_cost=round(best_cost, 4),
-                    best_values=best_values,
-                    status="running",
-                ))
-            except Exception:
-                pass  # Don't let callback errors break optimization
+        x_clamped = [max(lo, min(hi, v)) for v, lo, hi in zip(x, lows, highs)]
+
+        # Evaluate (unless this point was already simulated)
+        key = tuple([round(v, 6) for v in x_clamped])
+        cost = cost_cache.get(key)
+        if cost is None:
+            modified_wires = _apply_variables(request.wires, plan, x_clamped)
+            cost = _evaluate_objective(request, modified_wires, base_wires)
+            cost_cache[key] = cost
+
+        with lock:
+            iteration_count += 1
+
+            # Track history
+            evaluated.append((key, cost))
+            if cost < best_cost:
+                best_cost = cost
+                best_values.update(zip(var_names, key))
+
+            if iteration_count % 10 == 0:
+                logger.info(
+                    "Optimizer iteration %d: cost=%.4f, best=%.4f",
+                    iteration_count, cost, best_cost,
+                )
+
+            # Emit progress callback
+            if on_progress is not None:
+                try:
+                    on_progress(OptimizationProgress(
+                        iteration=iteration_count,
+                        total_iterations=request.max_iterations,
+                        current_cost=round(cost, 4),
+                        best_cost=round(best_cost, 4),
+                        best_values=best_values,
+                        status="running",
+                    ))
+                except Exception:
+                    pass  # Don't let callback errors break optimization
 
         return cost
 
+    def build_history() -> list[dict[str, Any]]:
+        return [
+            {"iteration": i, "cost": round(cost, 4), "values": dict(zip(var_names, key))}
+            for i, (key, cost) in enumerate(evaluated, 1)
+        ]
+
     start_time = time.perf_counter()
 
     try:
-        result = minimize(
-            objective_fn,
-            x0=x0,
-            method="Nelder-Mead",
-            options={
-                "maxiter": request.max_iterations,
-                "xatol": 0.001,
-                "fatol": 0.001,
-                "adaptive": True,
-            },
-        )
+        if request.method == OptimizationMethod.BAYESIAN:
+            result = gp_minimize(objective_fn, x0, bounds, n_calls=request.max_iterations)
+        elif request.method == OptimizationMethod.DIFFERENTIAL_EVOLUTION:
+            result = _differential_evolution(objective_fn, x0, bounds, request.max_iterations)
+        else:
+            # Bounds keep the simplex inside the box, rather than spending
+            # evaluations on vertices objective_fn clamps onto the same point
+            result = minimize(
+                objective_fn,
+                x0=[max(lo, min(hi, v)) for v, lo, hi in zip(x0, lows, highs)],
+                method="Nelder-Mead",
+                bounds=bounds,
+                options={
+                    "maxiter": request.max_iterations,
+                    "xatol": 0.001,
+                    "fatol": 0.001,
+                    "adaptive": True,
+                },
+            )
 
         elapsed = time.perf_counter() - start_time
 
@@ -278,7 +500,7 @@ def run_optimization(
         final_values = [
             max(b[0], min(b[1], v)) for v, b in zip(result.x, bounds)
         ]
-        optimized_wires = _apply_variables(request.wires, variables, final_values)
+        optimized_wires = _apply_variables(request.wires, plan, final_values)
 
         status = "success" if result.success else "max_iterations"
         message = result.message if hasattr(result, "message") else ""
@@ -296,7 +518,7 @@ def run_optimization(
                 name: round(val, 6) for name, val in zip(var_names, final_values)
             },
             optimized_wires=optimized_wires,
-            history=history,
+            history=build_history(),
             message=str(message),
         )
 
@@ -308,6 +530,6 @@ def run_optimization(
             final_cost=best_cost if best_cost < 1e6 else 0,
             optimized_values={name: round(val, 6) for name, val in zip(var_names, x0)},
             optimized_wires=request.wires,
-            history=history,
+            history=build_history(),
             message=str(e),
         )
@@ -0,0 +1,157 @@
+"""Gaussian-process surrogate minimizer (Bayesian optimization).
+
+Fits a GP to every cost evaluated so far and spends the next evaluation
+where Expected Improvement is highest. Each evaluation is a full NEC2 run,
+so this typically reaches a given cost in far fewer runs than Nelder-Mead.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.optimize import OptimizeResult
+from scipy.special import ndtr
+from scipy.stats import qmc
+
+# Length scales tried for the (unit cube) Matern 5/2 kernel; the one with the
+# highest marginal likelihood is used for each step
+_LENGTH_SCALES = (0.05, 0.1, 0.2, 0.4, 0.8)
+_NOISE = 1e-6
+# Random EI candidates per step, plus the same again scattered around the
+# incumbent
+_CANDIDATES = 1000
+_LOCAL_SIGMA = 0.05
+
+# scipy.linalg.cho_factor result: (triangular factor, lower)
+_Factor = tuple[npt.NDArray[np.float64], bool]
+
+
+def _matern52(
+    a: npt.NDArray[np.float64], b: npt.NDArray[np.float64], length_scale: float
+) -> npt.NDArray[np.float64]:
+    """Matern 5/2 kernel matrix between the rows of a and b."""
+    sq = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2.0 * a @ b.T
+    r = np.sqrt(np.maximum(sq, 0.0)) * (np.sqrt(5.0) / length_scale)
+    k: npt.NDArray[np.float64] = (1.0 + r + r * r / 3.0) * np.exp(-r)
+    return k
+
+
+def _fit(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]
+) -> tuple[float, _Factor, npt.NDArray[np.float64]]:
+    """(length_scale, cholesky factor, alpha) maximizing the marginal likelihood."""
+    best = None
+    for length_scale in _LENGTH_SCALES:
+        k = _matern52(x, x, length_scale)
+        k[np.diag_indices_from(k)] += _NOISE
+        try:
+            factor = cho_factor(k, lower=True)
+        except np.linalg.LinAlgError:
+            continue
+        alpha = cho_solve(factor, y)
+        log_ml = -0.5 * y @ alpha - np.log(np.diag(factor[0])).sum()
+        if best is None or log_ml > best[0]:
+            best = (log_ml, length_scale, factor, alpha)
+    if best is None:
+        raise np.linalg.LinAlgError("GP kernel matrix is not positive definite")
+    return best[1:]
+
+
+def _expected_improvement(
+    cand: npt.NDArray[np.float64],
+    x: npt.NDArray[np.float64],
+    y_best: float,
+    length_scale: float,
+    factor: _Factor,
+    alpha: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """EI (for minimization) of each candidate row under the fitted GP."""
+    k_star = _matern52(cand, x, length_scale)
+    mu = k_star @ alpha
+    v = solve_triangular(factor[0], k_star.T, lower=True, check_finite=False)
+    sigma = np.sqrt(np.maximum(1.0 - (v * v).sum(0), 1e-12))
+    z = (y_best - mu) / sigma
+    ei: npt.NDArray[np.float64] = (
+        (y_best - mu) * ndtr(z) + sigma * np.exp(-0.5 * z * z) / np.sqrt(2.0 * np.pi)
+    )
+    return ei
+
+
+def gp_minimize(
+    fn: Callable[[list[float]], float],
+    x0: list[float],
+    bounds: list[tuple[float, float]],
+    n_calls: int,
+    n_initial: int | None = None,
+    seed: int = 0,
+) -> OptimizeResult:
+    """Minimize fn within bounds using at most n_calls evaluations.
+
+    x0 plus a Latin hypercube of n_initial - 1 points (default 2 per
+    dimension, at least 5) seed the model; the remaining calls each go to
+    the point of highest Expected Improvement.
+
+    Returns a scipy OptimizeResult (x, fun, nfev, success, message).
+    """
+    lo = np.array([b[0] for b in bounds], dtype=np.float64)
+    hi = np.array([b[1] for b in bounds], dtype=np.float64)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    dims = len(bounds)
+    rng = np.random.default_rng(seed)
+
+    if n_initial is None:
+        n_initial = max(5, 2 * dims)
+    n_initial = max(1, min(n_initial, n_calls))
+
+    start = np.clip((np.asarray(x0, dtype=np.float64) - lo) / span, 0.0, 1.0)
+    initial = [start]
+    if n_initial > 1:
+        initial.extend(qmc.LatinHypercube(d=dims, seed=rng).random(n_initial - 1))
+
+    xs: list[np.ndarray] = []
+    ys: list[float] = []
+
+    def evaluate(u: np.ndarray) -> None:
+        xs.append(u)
+        ys.append(float(fn((lo + u * span).tolist())))
+
+    for u in initial:
+        evaluate(u)
+
+    while len(ys) < n_calls:
+        x = np.array(xs)
+        y = np.array(ys)
+        # Cap outliers (e.g. failed-simulation penalties) so they don't
+        # flatten the model everywhere else
+        median = float(np.median(y))
+        y = np.minimum(y, median + 2.0 * (median - y.min()) + 1e-9)
+        scale = y.std() or 1.0
+        y_norm = (y - y.mean()) / scale
+
+        try:
+            length_scale, factor, alpha = _fit(x, y_norm)
+        except np.linalg.LinAlgError:
+            evaluate(rng.random(dims))
+            continue
+
+        incumbent = x[int(np.argmin(y_norm))]
+        cand = np.vstack([
+            rng.random((_CANDIDATES, dims)),
+            np.clip(incumbent + rng.normal(0.0, _LOCAL_SIGMA, (_CANDIDATES, dims)), 0.0, 1.0),
+        ])
+        ei = _expected_improvement(cand, x, float(y_norm.min()), length_scale, factor, alpha)
+        nxt = cand[int(np.argmax(ei))]
+        # An already evaluated point teaches the model nothing: explore instead
+        if np.abs(x - nxt).max(axis=1).min() < 1e-9:
+            nxt = rng.random(dims)
+        evaluate(nxt)
+
+    best = int(np.argmin(ys))
+    return OptimizeResult(
+        x=lo + xs[best] * span,
+        fun=ys[best],
+        nfev=len(ys),
+        success=True,
+        message=f"Best of {len(ys)} surrogate-guided evaluations",
+    )
@@ -0,0 +1,135 @@
+"""Tests for the nec2c output parser.
+
+Every case is parsed twice: with the NumPy pattern-table fast path, and
+with it disabled so each pattern row goes through the per-row parser.
+Both must give identical results.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from src.simulation import nec_output
+from src.simulation.nec_output import _round_array, parse_nec_output
+
+FIXTURE = (Path(__file__).parent / "fixtures" / "dipole-freespace.txt").read_bytes()
+
+ROW_85 = (
+    b"       -85.00     0.00       -7.84       2.15       2.23     0.00000    90.00      LINEAR"
+)
+ROW_80 = (
+    b"       -80.00     0.00       -1.78       2.15       2.83     0.00000    90.00      LINEAR"
+)
+
+
+def _replace(old: bytes, new: bytes) -> bytes:
+    assert old in FIXTURE
+    return FIXTURE.replace(old, new)
+
+
+CASES: dict[str, bytes] = {
+    "plain": FIXTURE,
+    "crlf": FIXTURE.replace(b"\n", b"\r\n"),
+    # A whitespace-only line ends the pattern section
+    "whitespace_line": _replace(ROW_80, b"      \n" + ROW_80),
+    "abutted_columns": _replace(
+        b"8.4523E-03  1.3246E-04", b"8.4523E-03-1.3246E-04"
+    ).replace(b"       -85.00     0.00       -7.84", b"       -85.00     0.00-7.84"),
+    # Later copy of a row wins on the grid
+    "duplicate_row": _replace(ROW_85, ROW_85 + b"\n" + ROW_85.replace(b"2.23", b"4.56")),
+    "off_grid_rows": _replace(
+        ROW_85, ROW_85.replace(b"     0.00  ", b"     1.00  ")
+    ).replace(ROW_80, ROW_80.replace(b"     0.00  ", b"   400.00  ")),
+    "junk_in_pattern": _replace(ROW_80, b"  garbage text here\n" + ROW_80),
+    "two_frequencies": FIXTURE + FIXTURE.replace(b"1.4100E+01", b"1.4200E+01"),
+    # Current values that sit exactly on a rounding tie at 8 decimals
+    "current_ties": _replace(b"1.3246E-04", b"1.2345E-05").replace(
+        b"-3.1256E-06", b"-2.5000E-08"
+    ),
+}
+
+
+def _parse(output: bytes) -> list[dict[str, Any]]:
+    results = parse_nec_output(
+        output,
+        n_theta=37, n_phi=73, theta_start=-90.0, theta_step=5.0, phi_start=0.0, phi_step=5.0,
+        compute_currents=True,
+    )
+    return [fr.model_dump() for fr in results]
+
+
+@pytest.fixture
+def per_row(monkeypatch: pytest.MonkeyPatch) -> Callable[[bytes], list[dict[str, Any]]]:
+    """_parse with the pattern-table fast path disabled."""
+
+    def parse(output: bytes) -> list[dict[str, Any]]:
+        with monkeypatch.context() as m:
+            m.setattr(nec_output, "_pattern_table", lambda block: None)
+            return _parse(output)
+
+    return parse
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_fast_path_matches_per_row_parse(
+    name: str, per_row: Callable[[bytes], list[dict[str, Any]]]
+) -> None:
+    assert _parse(CASES[name]) == per_row(CASES[name])
+
+
+def test_fast_path_is_taken_on_clean_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    tables: list[np.ndarray | None] = []
+    pattern_table = nec_output._pattern_table
+
+    def spy(block: list[bytes]) -> np.ndarray | None:
+        tables.append(pattern_table(block))
+        return tables[-1]
+
+    monkeypatch.setattr(nec_output, "_pattern_table", spy)
+    _parse(FIXTURE)
+    assert tables and tables[0] is not None
+
+
+def test_parse_fixture() -> None:
+    (result,) = _parse(FIXTURE)
+    assert result["frequency_mhz"] == 14.1
+    assert result["impedance"] == {"real": 72.999, "imag": 0.6147}
+    assert result["gain_max_dbi"] == 6.76
+    assert len(result["currents"]) == 11
+    assert result["currents"][0]["current_imag"] == 0.00013246
+
+
+def test_crlf_matches_lf() -> None:
+    assert _parse(CASES["crlf"]) == _parse(FIXTURE)
+
+
+def test_two_frequencies() -> None:
+    assert [r["frequency_mhz"] for r in _parse(CASES["two_frequencies"])] == [14.1, 14.2]
+
+
+def test_current_ties_round_like_round() -> None:
+    (result,) = _parse(CASES["current_ties"])
+    assert result["currents"][0]["current_imag"] == round(1.2345e-05, 8)
+    assert result["currents"][8]["current_imag"] == round(-2.5e-08, 8)
+
+
+@pytest.mark.parametrize("ndigits", [2, 6, 8])
+def test_round_array_matches_round_on_ties(ndigits: int) -> None:
+    # Five significant digits, as nec2c prints them: many land on .5 ties
+    rng = np.random.default_rng(0)
+    mantissas = rng.integers(10000, 100000, 2000) / 10000.0
+    exponents = rng.integers(-12, 4, 2000).astype(np.float64)
+    signs = rng.choice([-1.0, 1.0], 2000)
+    values = np.concatenate([
+        signs * mantissas * 10.0 ** exponents,
+        [0.125, 2.675, 1.2345e-05, -2.5e-08, 0.5e-08, 1.5, -0.0],
+    ])
+    assert _round_array(values, ndigits) == [round(v, ndigits) for v in values.tolist()]
+
+
+def test_round_array_keeps_shape() -> None:
+    rows = _round_array(np.array([[0.125, 0.135], [1.005, -2.5]]), 2)
+    assert rows == [[round(0.125, 2), round(0.135, 2)], [round(1.005, 2), round(-2.5, 2)]]
@@ -0,0 +1,44 @@
+"""Tests for the Gaussian-process surrogate minimizer."""
+
+from src.simulation.surrogate import gp_minimize
+
+
+def test_gp_minimize_respects_n_calls_and_bounds() -> None:
+    bounds = [(-2.0, 3.0), (0.5, 4.0)]
+    calls: list[list[float]] = []
+
+    def fn(x: list[float]) -> float:
+        calls.append(x)
+        return (x[0] - 1.0) ** 2 + (x[1] - 2.0) ** 2
+
+    result = gp_minimize(fn, [0.0, 1.0], bounds, n_calls=25)
+
+    assert len(calls) == 25
+    assert result.nfev == 25
+    for x in calls:
+        for v, (lo, hi) in zip(x, bounds, strict=True):
+            assert lo <= v <= hi
+
+
+def test_gp_minimize_finds_quadratic_minimum() -> None:
+    def fn(x: list[float]) -> float:
+        return (x[0] - 1.0) ** 2 + (x[1] + 0.5) ** 2
+
+    result = gp_minimize(fn, [-3.0, 3.0], [(-4.0, 4.0), (-4.0, 4.0)], n_calls=40)
+
+    assert abs(result.x[0] - 1.0) < 0.2
+    assert abs(result.x[1] + 0.5) < 0.2
+    assert result.fun < 0.05
+    assert result.fun == fn(list(result.x))
+
+
+def test_gp_minimize_starts_from_x0() -> None:
+    calls: list[list[float]] = []
+
+    def fn(x: list[float]) -> float:
+        calls.append(x)
+        return x[0] ** 2
+
+    gp_minimize(fn, [0.75], [(-1.0, 1.0)], n_calls=3)
+
+    assert calls[0] == [0.75]
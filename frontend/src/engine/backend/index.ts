@@ -262,12 +262,20 @@ export class BackendEngine implements SimulationEngine {
         ws.onmessage = (event) => {
           try {
             const msg = JSON.parse(event.data as string) as {
-              type: "progress" | "result" | "error";
-              data: OptimizationProgress | OptimizationResult | { message: string };
+              type: "progress" | "progress_batch" | "result" | "error";
+              data:
+                | OptimizationProgress
+                | OptimizationProgress[]
+                | OptimizationResult
+                | { message: string };
             };
 
             if (msg.type === "progress") {
               onProgress(msg.data as OptimizationProgress);
+            } else if (msg.type === "progress_batch") {
+              for (const progress of msg.data as OptimizationProgress[]) {
+                onProgress(progress);
+              }
             } else if (msg.type === "result") {
               resolve(msg.data as OptimizationResult);
             } else if (msg.type === "error") {